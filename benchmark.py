@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SEED = 20240101
+
+def bench_start_new_hand():
+    from game.poker_game import PokerGame
+    game = PokerGame(6, 10, random.Random(SEED))
+    game.initialize_game([f"p{i}" for i in range(6)], 1000)
+    # Restore the fresh table each call; otherwise the blind seats bust
+    # after a few dozen hands and later calls time a degenerate deal
+    fresh = game.snapshot()
+    def run():
+        game.restore(fresh)
+        game.start_new_hand()
+    return run
+
+def bench_full_hand():
+    from game.bots import CallingStationBot
+    from game.simulator import HandSimulator
+    bots = [CallingStationBot(f"p{i}") for i in range(6)]
+    simulator = HandSimulator(bots, rng=random.Random(SEED))
+    return simulator.play_hand
+
+def _river_game(num_players):
+    from game.poker_game import PokerGame
+    game = PokerGame(num_players, 10, random.Random(SEED))
+    game.initialize_game([f"p{i}" for i in range(num_players)], 1000)
+    game.start_new_hand()
+    for _ in range(3):
+        game.deal_next_street()
+    return game
+
+def bench_evaluate_hands(num_players):
+    def setup():
+        return _river_game(num_players).evaluate_hands
+    return setup
+
+def bench_exact_equity(board_size):
+    def setup():
+        from game.equity import exact_equity
+        game = _river_game(2)
+        hands = [p.cards for p in game.players]
+        board = game.community_cards[:board_size]
+        return lambda: exact_equity(hands, board)
+    return setup
+
+def bench_icm_final_table():
+    import numpy as np
+    from game.icm import icm
+    stacks = np.random.default_rng(SEED).integers(1, 20000, 10)
+    payouts = [30, 20, 14, 10, 8, 6, 5, 4, 3]
+    return lambda: icm(stacks, payouts)
+
+def bench_import_headless():
+    # A fresh interpreter importing the headless engine, as a worker process would
+    code = ("import sys, game.simulator, game.parallel\n"
+            "assert not {'PyQt6', 'treys', 'numpy'} & set(sys.modules), 'heavy module imported'")
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    return lambda: subprocess.run([sys.executable, '-c', code], cwd=cwd, check=True)
+
+_app = None
+
+def _qt_app():
+    # Headless boxes have no display; the offscreen platform still renders
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
+def _card_images(disk_cache: bool):
+    _qt_app()
+    from game import card_images
+    from game.cards import FULL_DECK
+    from game.card_images import CardAtlas, CardImages
+    # A private cache directory, so the benchmark never reads or deletes the user's atlas
+    cache = tempfile.TemporaryDirectory()
+
+    def build(save: bool):
+        user_cache, card_images.CACHE_DIR = card_images.CACHE_DIR, cache.name
+        try:
+            CardAtlas._shared.clear()
+            images = CardImages()
+            if not save:
+                images.atlas.save = lambda: None
+            for card in FULL_DECK:
+                images.get_card_image(card)
+            images.get_card_back()
+        finally:
+            card_images.CACHE_DIR = user_cache
+
+    if disk_cache:
+        build(save=True)
+    # Every call starts without the in-process atlas. The cold start draws all
+    # 52 faces plus the back; neither case times writing the PNG.
+    def run():
+        build(save=False)
+    return run
+
+def bench_card_images():
+    return _card_images(disk_cache=False)
+
+def bench_card_images_disk():
+    return _card_images(disk_cache=True)
+
+def bench_update_display():
+    app = _qt_app()
+    from game.poker_game import PokerGame
+    from game.poker_gui import PokerTable
+    window = PokerTable()
+    window.game = PokerGame(10, 10, random.Random(SEED))
+    window.game.initialize_game([f"p{i}" for i in range(10)], 1000)
+    window.create_player_widgets()
+    window.game.start_new_hand()
+    window.game.deal_next_street()
+    app.processEvents()
+    bench_update_display.window = window  # keep the window alive
+    return window.update_display
+
+BENCHMARKS = {
+    'start_new_hand': (bench_start_new_hand, 20000),
+    'full_hand': (bench_full_hand, 5000),
+    **{f'evaluate_hands_{n}': (bench_evaluate_hands(n), 20000) for n in (2, 4, 6, 8, 10)},
+    **{f'exact_equity_{street}': (bench_exact_equity(n), 2000)
+       for street, n in (('flop', 3), ('turn', 4), ('river', 5))},
+    'icm_final_table': (bench_icm_final_table, 2000),
+    'import_headless': (bench_import_headless, 20),
+    'card_images': (bench_card_images, 50),
+    'card_images_disk': (bench_card_images_disk, 50),
+    'update_display': (bench_update_display, 2000),
+}
+
+def run_benchmark(setup, iterations: int) -> dict:
+    fn = setup()
+    for _ in range(max(1, iterations // 10)):
+        fn()
+
+    timings = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        fn()
+        timings.append(clock() - start)
+    timings.sort()
+
+    # Peak memory is measured separately so tracing does not skew the timings
+    tracemalloc.start()
+    for _ in range(min(iterations, 100)):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings) / 1e9
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else 0.0,
+        'p50_us': timings[len(timings) // 2] / 1e3,
+        'p99_us': timings[min(len(timings) - 1, int(len(timings) * 0.99))] / 1e3,
+        'peak_memory_kb': peak / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas 性能基准测试")
+    parser.add_argument('-k', '--filter', default='', help="只运行名称包含该字符串的用例")
+    parser.add_argument('--scale', type=float, default=1.0, help="迭代次数缩放系数")
+    parser.add_argument('-o', '--output', help="JSON 结果输出文件（默认输出到标准输出）")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (setup, iterations) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        results[name] = run_benchmark(setup, max(1, int(iterations * args.scale)))
+        print(f"{name:>20}  {results[name]['ops_per_sec']:>12.0f} ops/s  "
+              f"p50 {results[name]['p50_us']:.1f}us  p99 {results[name]['p99_us']:.1f}us",
+              file=sys.stderr)
+
+    report = {
+        'meta': {
+            'seed': SEED,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
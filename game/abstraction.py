@@ -0,0 +1,91 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from .equity import equity_vs_random
+from .evaluator import CARD_TO_INDEX
+from .poker_game import PokerGame
+from .ranges import COMBO_CLASS, COMBO_INDEX, HAND_CLASSES, preflop_order
+
+STREETS = ['preflop', 'flop', 'turn', 'river']
+
+# Abstract actions; every infoset row in the CFR tables has this many columns
+FOLD, PASSIVE = 0, 1  # PASSIVE is check or call, whichever is legal
+BET_FRACTIONS = (0.5, 1.0, 2.0)  # raise sizes as fractions of the pot after calling
+ALL_IN = 2 + len(BET_FRACTIONS)
+NUM_ACTIONS = ALL_IN + 1
+
+
+class CardBucketer:
+    """把手牌归入有限个桶：翻牌前按起手牌强弱排名，翻牌后按对抗随机手牌的胜率"""
+    def __init__(self, preflop_buckets: int = 8, postflop_buckets: int = 10,
+                 samples: int = 128, rng: Optional[np.random.Generator] = None):
+        self.preflop_buckets = preflop_buckets
+        self.postflop_buckets = postflop_buckets
+        self.samples = samples
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Strength position of each of the 169 classes
+        position = np.empty(len(HAND_CLASSES), dtype=np.int64)
+        position[preflop_order()] = np.arange(len(HAND_CLASSES))
+        self._class_bucket = position * preflop_buckets // len(HAND_CLASSES)
+
+    def preflop(self, hole: Sequence[int]) -> int:
+        a, b = sorted(CARD_TO_INDEX[c] for c in hole)
+        return int(self._class_bucket[COMBO_CLASS[COMBO_INDEX[(a, b)]]])
+
+    def postflop(self, hole: Sequence[int], board: Sequence[int]) -> int:
+        equity = equity_vs_random(hole, board, 1, self.samples, self.rng)
+        return min(int(equity * self.postflop_buckets), self.postflop_buckets - 1)
+
+    def deal_buckets(self, game: PokerGame) -> List[List[int]]:
+        """刚发完底牌时，为每名玩家计算四条街的桶
+
+        剩余的牌从牌堆末尾依次发出，因此整手牌的公共牌此时已经确定。
+        """
+        deck = game.state.deck
+        board = [deck[-1], deck[-2], deck[-3], deck[-4], deck[-5]]
+        buckets = []
+        for player in game.players:
+            hole = player.cards
+            buckets.append([self.preflop(hole)]
+                           + [self.postflop(hole, board[:n]) for n in (3, 4, 5)])
+        return buckets
+
+
+def raise_targets(pot: int, current_bet: int, bet: int, chips: int,
+                  big_blind: int) -> List[Tuple[int, int]]:
+    """各个加注比例折算出的 (动作编号, 加注到的金额)，最后一项是全下
+
+    不同比例折算出相同金额时只保留一个，达到筹码上限的比例归入全下。
+    """
+    all_in = chips + bet
+    call = current_bet - bet
+    targets = []
+    for code, fraction in enumerate(BET_FRACTIONS, start=2):
+        target = current_bet + max(big_blind, int(fraction * (pot + call)))
+        if target < all_in and (not targets or target > targets[-1][1]):
+            targets.append((code, target))
+    targets.append((ALL_IN, all_in))
+    return targets
+
+def translate_raise(amount: int, pot: int, current_bet: int, bet: int, chips: int,
+                    big_blind: int) -> int:
+    """把实际的加注额映射到最接近的抽象加注"""
+    targets = raise_targets(pot, current_bet, bet, chips, big_blind)
+    return min(targets, key=lambda t: abs(t[1] - amount))[0]
+
+def abstract_actions(game: PokerGame, allow_raise: bool = True) -> List[Tuple[int, str, Optional[int]]]:
+    """当前玩家可用的抽象动作：(动作编号, PokerGame 动作, 加注额)"""
+    st = game.state
+    i = st.current_player_idx
+    valid = game.get_valid_actions(game.players[i])
+    actions = []
+    if valid['fold']:
+        actions.append((FOLD, 'fold', None))
+    if valid['check']:
+        actions.append((PASSIVE, 'check', None))
+    elif valid['call']:
+        actions.append((PASSIVE, 'call', None))
+    if valid['raise'] and allow_raise:
+        for code, target in raise_targets(st.pot, st.current_bet, st.bets[i], st.chips[i],
+                                          game.big_blind):
+            actions.append((code, 'raise', target))
+    return actions
\ No newline at end of file
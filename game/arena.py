@@ -0,0 +1,125 @@
+from typing import List, Optional, Sequence
+import random
+import time
+from .poker_game import PokerGame
+from .policies import Observations, Policy, apply_actions
+
+
+class ArenaResult:
+    def __init__(self, names: List[str], big_blind: int):
+        self.names = names
+        self.big_blind = big_blind
+        self.hands = 0
+        self.showdowns = 0
+        self.decisions = 0
+        self.batches = 0
+        self.illegal = 0
+        self.elapsed = 0.0
+        self.chip_deltas = [0] * len(names)
+        self.seat_hands = [0] * len(names)  # hands dealt to each policy, over all its seats
+
+    @property
+    def hands_per_sec(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def decisions_per_sec(self) -> float:
+        return self.decisions / self.elapsed if self.elapsed > 0 else 0.0
+
+    def bb_per_100(self, i: int) -> float:
+        """第 i 个策略每 100 手赢得的大盲数"""
+        if not self.seat_hands[i]:
+            return 0.0
+        return self.chip_deltas[i] / self.big_blind / self.seat_hands[i] * 100
+
+
+class Arena:
+    """批量策略对战场：多张牌桌同步推进，每一步把所有等待决策的牌桌按策略分组，
+    每个策略只调用一次 act_batch
+
+    第 t 张桌第 s 个座位由 policies[(s + t) % len(policies)] 决策，各策略轮流坐遍所有位置。
+    与 HandSimulator 一样每手牌开始前把筹码重置为 initial_chips。
+    """
+    def __init__(self, policies: Sequence[Policy], num_tables: int = 256, seats: int = 6,
+                 small_blind: int = 10, initial_chips: int = 1000, seed: Optional[int] = None):
+        if not 2 <= seats <= 10:
+            raise ValueError("每桌人数必须在2到10之间")
+        self.policies = list(policies)
+        self.initial_chips = initial_chips
+        rng = random.Random(seed)
+        self.games: List[PokerGame] = []
+        for t in range(num_tables):
+            game = PokerGame(seats, small_blind, random.Random(rng.getrandbits(64)))
+            game.initialize_game([f"seat-{s + 1}" for s in range(seats)], initial_chips)
+            self.games.append(game)
+        self.seat_policy = [[(s + t) % len(self.policies) for s in range(seats)]
+                            for t in range(num_tables)]
+
+    def _advance(self, game: PokerGame) -> bool:
+        # Deal streets until someone has to act; False once the hand is over
+        while True:
+            if game.state.folded.count(0) == 1:
+                return False
+            if not game.is_round_complete():
+                return True
+            if game.round_state == 'river':
+                return False
+            game.deal_next_street()
+
+    def _start(self, t: int, result: ArenaResult):
+        game = self.games[t]
+        chips = game.state.chips
+        for s in range(game.num_players):
+            chips[s] = self.initial_chips
+            result.seat_hands[self.seat_policy[t][s]] += 1
+        game.start_new_hand()
+
+    def _finish(self, t: int, result: ArenaResult):
+        game = self.games[t]
+        if game.state.folded.count(0) > 1:
+            result.showdowns += 1
+        game.award_pot()
+        chips = game.state.chips
+        for s in range(game.num_players):
+            result.chip_deltas[self.seat_policy[t][s]] += chips[s] - self.initial_chips
+        game.dealer_idx = (game.dealer_idx + 1) % game.num_players
+        result.hands += 1
+
+    def run(self, num_hands: int) -> ArenaResult:
+        names = [f"{policy.name}-{i + 1}" for i, policy in enumerate(self.policies)]
+        result = ArenaResult(names, self.games[0].big_blind)
+        start = time.perf_counter()
+        started = 0
+        live = []
+        for t in range(min(num_hands, len(self.games))):
+            self._start(t, result)
+            started += 1
+            live.append(t)
+
+        while live:
+            waiting: List[List[int]] = [[] for _ in self.policies]
+            still_live = []
+            for t in live:
+                game = self.games[t]
+                while not self._advance(game):
+                    self._finish(t, result)
+                    if started == num_hands:
+                        break
+                    self._start(t, result)
+                    started += 1
+                else:
+                    waiting[self.seat_policy[t][game.current_player_idx]].append(t)
+                    still_live.append(t)
+            live = still_live
+
+            # One act_batch call per policy for every table waiting on it
+            for policy, tables in zip(self.policies, waiting):
+                if not tables:
+                    continue
+                games = [self.games[t] for t in tables]
+                actions, amounts = policy.act_batch(Observations(games))
+                result.illegal += apply_actions(games, actions, amounts)
+                result.decisions += len(tables)
+                result.batches += 1
+        result.elapsed = time.perf_counter() - start
+        return result
\ No newline at end of file
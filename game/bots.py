@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Tuple
+import random
+from .poker_game import PokerGame, Player
+
+Action = Tuple[str, Optional[int]]
+
+class Bot:
+    """机器人策略基类：根据当前局面返回 (动作, 加注金额)"""
+    def __init__(self, name: str):
+        self.name = name
+
+    def act(self, game: PokerGame, player: Player, valid_actions: Dict[str, bool]) -> Action:
+        raise NotImplementedError
+
+    def min_raise(self, game: PokerGame, player: Player) -> Optional[int]:
+        # Smallest legal raise target, capped at what the player can put in
+        amount = min(game.current_bet + game.big_blind, player.chips + player.current_bet)
+        if amount <= game.current_bet:
+            return None
+        return amount
+
+class CallingStationBot(Bot):
+    """永远让牌或跟注，从不加注"""
+    def act(self, game: PokerGame, player: Player, valid_actions: Dict[str, bool]) -> Action:
+        if valid_actions['check']:
+            return 'check', None
+        if valid_actions['call']:
+            return 'call', None
+        return 'fold', None
+
+class RandomBot(Bot):
+    """在合法动作中随机选择"""
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
+        super().__init__(name)
+        self.rng = rng or random.Random()
+
+    def act(self, game: PokerGame, player: Player, valid_actions: Dict[str, bool]) -> Action:
+        actions = [action for action, ok in valid_actions.items() if ok]
+        action = self.rng.choice(actions)
+        if action == 'raise':
+            amount = self.min_raise(game, player)
+            if amount is None:
+                return ('check', None) if valid_actions['check'] else ('fold', None)
+            return 'raise', amount
+        return action, None
+
+class AggressiveBot(Bot):
+    """能加注就以最小加注额加注"""
+    def act(self, game: PokerGame, player: Player, valid_actions: Dict[str, bool]) -> Action:
+        if valid_actions['raise']:
+            amount = self.min_raise(game, player)
+            if amount is not None:
+                return 'raise', amount
+        if valid_actions['check']:
+            return 'check', None
+        if valid_actions['call']:
+            return 'call', None
+        return 'fold', None
+
+BOTS = {
+    'call': CallingStationBot,
+    'random': RandomBot,
+    'raise': AggressiveBot,
+}
+
+def make_bots(names: List[str], rng: Optional[random.Random] = None) -> List[Bot]:
+    """按策略名称创建机器人，随机策略的种子取自 rng"""
+    rng = rng or random.Random()
+    bots = []
+    for i, name in enumerate(names):
+        bot_cls = BOTS[name]
+        if bot_cls is RandomBot:
+            bots.append(bot_cls(f"{name}-{i+1}", random.Random(rng.getrandbits(64))))
+        else:
+            bots.append(bot_cls(f"{name}-{i+1}"))
+    return bots
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import IO, Callable
+import os
+import threading
+
+# Where generated artifacts (lookup tables, card atlases) are kept between runs
+CACHE_DIR = os.environ.get('PYPOKER_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'pypoker-texas'))
+
+def atomic_write(path: str, writer: Callable[[IO], None], mode: str = 'wb'):
+    """先把 writer 的输出写入同目录下的临时文件，再原子地替换 path
+
+    其他进程（或线程）因此永远读不到写了一半的文件；出错时删除临时文件并重新抛出异常。
+    """
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, mode) as f:
+            writer(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
\ No newline at end of file
@@ -1,95 +1,174 @@
-from PyQt6.QtGui import QPixmap, QPainter
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPainter, QGuiApplication
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice, QRect, QSize
+from typing import Dict, Optional, Tuple
 import os
-from treys import Card
+from .cache import CACHE_DIR, atomic_write
+
+SUITS = ['s', 'h', 'd', 'c']  # 黑桃、红心、方块、梅花
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+SUIT_COLORS = {
+    's': Qt.GlobalColor.black,  # 黑桃
+    'h': Qt.GlobalColor.red,    # 红心
+    'd': Qt.GlobalColor.red,    # 方块
+    'c': Qt.GlobalColor.black   # 梅花
+}
+SUIT_SYMBOLS = {
+    's': '♠',  # 黑桃
+    'h': '♥',  # 红心
+    'd': '♦',  # 方块
+    'c': '♣'   # 梅花
+}
+TREYS_SUIT_BITS = [1, 2, 4, 8]  # s, h, d, c
+
+# Part of the atlas file name; bump it whenever the card drawing changes so
+# stale sheets on disk are ignored
+ATLAS_VERSION = 1
+
+class CardAtlas:
+    """所有牌面绘制在同一张精灵图上，按尺寸和DPI在进程内共享并缓存到磁盘
+
+    第一行到第四行依次是黑桃、红心、方块、梅花的13张牌，第五行第一格是牌背。
+    没有磁盘缓存时，每张牌在第一次使用时才绘制。
+    """
+    _shared: Dict[Tuple[int, int, float], 'CardAtlas'] = {}
+
+    def __init__(self, width: int, height: int, dpr: float = 1.0):
+        self.width = width
+        self.height = height
+        self.dpr = dpr
+        self.path = os.path.join(CACHE_DIR,
+                                 f'cards_v{ATLAS_VERSION}_{width}x{height}@{dpr:g}.png')
+        self._pixmaps: Dict[Tuple[int, int], QPixmap] = {}
+
+        self.sheet = QPixmap(self.path)
+        if not self.sheet.isNull() and self.sheet.size() == self._sheet_size():
+            self._rendered = set(self._all_cells())
+        else:
+            self.sheet = QPixmap(self._sheet_size())
+            self.sheet.fill(Qt.GlobalColor.transparent)
+            self._rendered = set()
+        self.sheet.setDevicePixelRatio(dpr)
+
+    @classmethod
+    def shared(cls, width: int, height: int, dpr: Optional[float] = None) -> 'CardAtlas':
+        if dpr is None:
+            screen = QGuiApplication.primaryScreen()
+            dpr = screen.devicePixelRatio() if screen else 1.0
+        key = (width, height, dpr)
+        if key not in cls._shared:
+            cls._shared[key] = cls(width, height, dpr)
+        return cls._shared[key]
+
+    def _sheet_size(self) -> QSize:
+        return QSize(round(13 * self.width * self.dpr), round(5 * self.height * self.dpr))
+
+    @staticmethod
+    def _all_cells():
+        return [(row, col) for row in range(4) for col in range(13)] + [(4, 0)]
+
+    def cell_rect(self, row: int, col: int) -> QRect:
+        """牌在精灵图中的区域（设备无关像素）"""
+        return QRect(col * self.width, row * self.height, self.width, self.height)
+
+    def pixmap(self, row: int, col: int) -> QPixmap:
+        cached = self._pixmaps.get((row, col))
+        if cached is not None:
+            return cached
+        if (row, col) not in self._rendered:
+            self._render_cell(row, col)
+
+        d = self.dpr
+        source = QRect(round(col * self.width * d), round(row * self.height * d),
+                       round(self.width * d), round(self.height * d))
+        pixmap = self.sheet.copy(source)
+        pixmap.setDevicePixelRatio(d)
+        self._pixmaps[(row, col)] = pixmap
+        return pixmap
+
+    def _render_cell(self, row: int, col: int):
+        painter = QPainter(self.sheet)
+        rect = self.cell_rect(row, col)
+        painter.translate(rect.x(), rect.y())
+        if row == 4:
+            self._paint_back(painter)
+        else:
+            self._paint_card(painter, RANKS[col], SUITS[row])
+        painter.end()
+
+        self._rendered.add((row, col))
+        if len(self._rendered) == len(self._all_cells()):
+            self.save()
+
+    def _paint_back(self, painter: QPainter):
+        """绘制一个简单的卡牌背面图像"""
+        painter.fillRect(0, 0, self.width, self.height, Qt.GlobalColor.blue)
+        painter.setPen(Qt.GlobalColor.white)
+        painter.drawRect(2, 2, self.width-4, self.height-4)
+
+    def _paint_card(self, painter: QPainter, rank: str, suit: str):
+        painter.fillRect(0, 0, self.width, self.height, Qt.GlobalColor.white)
+        painter.setPen(SUIT_COLORS[suit])
+
+        # 绘制边框
+        painter.drawRect(0, 0, self.width-1, self.height-1)
+
+        # 绘制花色和点数
+        font = painter.font()
+        font.setPointSize(16)
+        painter.setFont(font)
+
+        # 左上角
+        painter.drawText(5, 20, rank)
+        font.setPointSize(20)
+        painter.setFont(font)
+        painter.drawText(5, 45, SUIT_SYMBOLS[suit])
+
+        # 中央
+        font.setPointSize(32)
+        painter.setFont(font)
+        painter.drawText(self.width//2 - 15,
+                       self.height//2 + 15,
+                       SUIT_SYMBOLS[suit])
+
+        # 右下角（倒置）
+        painter.translate(self.width, self.height)
+        painter.rotate(180)
+        font.setPointSize(16)
+        painter.setFont(font)
+        painter.drawText(5, 20, rank)
+        font.setPointSize(20)
+        painter.setFont(font)
+        painter.drawText(5, 45, SUIT_SYMBOLS[suit])
+
+    def save(self):
+        """把完整的精灵图写入磁盘缓存"""
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if not self.sheet.save(buffer, 'PNG'):
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            atomic_write(self.path, lambda f: f.write(data.data()))
+        except OSError:
+            pass
 
 class CardImages:
     CARD_WIDTH = 71
     CARD_HEIGHT = 96
-    
+
     def __init__(self):
-        self.card_back = self._create_card_back()
-        self.card_images = {}
-        self._initialize_card_images()
-        
-    def _create_card_back(self) -> QPixmap:
-        """创建一个简单的卡牌背面图像"""
-        pixmap = QPixmap(self.CARD_WIDTH, self.CARD_HEIGHT)
-        pixmap.fill(Qt.GlobalColor.blue)
-        painter = QPainter(pixmap)
-        painter.setPen(Qt.GlobalColor.white)
-        painter.drawRect(2, 2, self.CARD_WIDTH-4, self.CARD_HEIGHT-4)
-        painter.end()
-        return pixmap
-        
-    def _initialize_card_images(self):
-        """初始化所有扑克牌图像"""
-        suits = ['s', 'h', 'd', 'c']  # 黑桃、红心、方块、梅花
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-        colors = {
-            's': Qt.GlobalColor.black,  # 黑桃
-            'h': Qt.GlobalColor.red,    # 红心
-            'd': Qt.GlobalColor.red,    # 方块
-            'c': Qt.GlobalColor.black   # 梅花
-        }
-        suit_symbols = {
-            's': '♠',  # 黑桃
-            'h': '♥',  # 红心
-            'd': '♦',  # 方块
-            'c': '♣'   # 梅花
-        }
-        
-        for suit in suits:
-            for rank in ranks:
-                card_str = rank + suit
-                card_int = Card.new(card_str)
-                
-                # 创建卡牌图像
-                pixmap = QPixmap(self.CARD_WIDTH, self.CARD_HEIGHT)
-                pixmap.fill(Qt.GlobalColor.white)
-                
-                painter = QPainter(pixmap)
-                painter.setPen(colors[suit])
-                
-                # 绘制边框
-                painter.drawRect(0, 0, self.CARD_WIDTH-1, self.CARD_HEIGHT-1)
-                
-                # 绘制花色和点数
-                font = painter.font()
-                font.setPointSize(16)
-                painter.setFont(font)
-                
-                # 左上角
-                painter.drawText(5, 20, rank)
-                font.setPointSize(20)
-                painter.setFont(font)
-                painter.drawText(5, 45, suit_symbols[suit])
-                
-                # 中央
-                font.setPointSize(32)
-                painter.setFont(font)
-                painter.drawText(self.CARD_WIDTH//2 - 15, 
-                               self.CARD_HEIGHT//2 + 15, 
-                               suit_symbols[suit])
-                
-                # 右下角（倒置）
-                painter.translate(self.CARD_WIDTH, self.CARD_HEIGHT)
-                painter.rotate(180)
-                font.setPointSize(16)
-                painter.setFont(font)
-                painter.drawText(5, 20, rank)
-                font.setPointSize(20)
-                painter.setFont(font)
-                painter.drawText(5, 45, suit_symbols[suit])
-                
-                painter.end()
-                
-                self.card_images[card_int] = pixmap
-                
+        # 所有牌桌共享同一张精灵图，创建本身不绘制任何牌面
+        self.atlas = CardAtlas.shared(self.CARD_WIDTH, self.CARD_HEIGHT)
+
     def get_card_image(self, card_int) -> QPixmap:
         """获取指定卡牌的图像"""
-        return self.card_images.get(card_int, self.card_back)
-        
+        rank = (card_int >> 8) & 0xF
+        suit_bit = (card_int >> 12) & 0xF
+        if rank > 12 or suit_bit not in TREYS_SUIT_BITS:
+            return self.get_card_back()
+        return self.atlas.pixmap(TREYS_SUIT_BITS.index(suit_bit), rank)
+
     def get_card_back(self) -> QPixmap:
         """获取卡牌背面的图像"""
-        return self.card_back 
\ No newline at end of file
+        return self.atlas.pixmap(4, 0)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import List
+
+# Same integer encoding as treys, built without importing it:
+# xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp (rank bit, suit bit, rank, rank prime)
+RANKS = '23456789TJQKA'
+SUITS = 'shdc'
+SUIT_BITS = {'s': 1, 'h': 2, 'd': 4, 'c': 8}
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+def new_card(text: str) -> int:
+    """'As' -> treys 整数牌"""
+    rank = RANKS.index(text[0])
+    return (1 << rank << 16) | (SUIT_BITS[text[1]] << 12) | (rank << 8) | PRIMES[rank]
+
+def card_to_str(card: int) -> str:
+    suit_bit = (card >> 12) & 0xF
+    return RANKS[(card >> 8) & 0xF] + next(s for s, bit in SUIT_BITS.items() if bit == suit_bit)
+
+# Same order as treys' Deck.GetFullDeck(), so seeded shuffles deal the same cards
+FULL_DECK: List[int] = [new_card(r + s) for r in RANKS for s in SUITS]
\ No newline at end of file
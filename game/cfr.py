@@ -0,0 +1,319 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import json
+import os
+import random
+import numpy as np
+from .abstraction import (NUM_ACTIONS, PASSIVE, STREETS, CardBucketer, abstract_actions,
+                          translate_raise)
+from .bots import Action, Bot
+from .cache import atomic_write
+from .parallel import chunk_seeds
+from .poker_game import PokerGame, Player
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+MASK64 = (1 << 64) - 1
+
+# Offsets keep the different kinds of history entries apart in the hash
+STREET_MARK = 16
+BUCKET_MARK = 32
+POSITION_MARK = 1024
+
+# Slots tried from an infoset's home slot before it evicts another infoset
+PROBES = 4
+
+def _mix(h: int, value: int) -> int:
+    return ((h ^ (value + 1)) * FNV_PRIME) & MASK64
+
+def infoset_key(history: int, street: int, bucket: int, position: int) -> int:
+    """信息集的64位键：下注历史、街道、手牌桶和相对庄家的位置"""
+    return _mix(_mix(_mix(history, STREET_MARK + street), BUCKET_MARK + bucket),
+                POSITION_MARK + position)
+
+
+class InfosetTable:
+    """按信息集哈希直接寻址的遗憾值与累计策略表，三个数组都以内存映射文件保存
+
+    每个槽位占 4 + 2 * 4 * NUM_ACTIONS 字节。槽位里存一个32位标签，
+    信息集从哈希对应的槽位起线性探测 PROBES 个槽位；都被其他信息集占用时
+    由后来者占用第一个槽位（清零其遗憾值与累计策略）并计入 collisions，据此调整表的大小。
+    多个训练进程可以同时以读写方式映射同一张表。
+    """
+    def __init__(self, path: str, num_slots: Optional[int] = None, readonly: bool = False):
+        self.path = path
+        tags_path = os.path.join(path, 'tags.u32')
+        if os.path.exists(tags_path):
+            num_slots = os.path.getsize(tags_path) // 4
+            mode = 'r' if readonly else 'r+'
+        elif num_slots is None or readonly:
+            raise FileNotFoundError(f"{path} 中没有信息集表")
+        else:
+            os.makedirs(path, exist_ok=True)
+            mode = 'w+'
+        self.num_slots = num_slots
+        self.readonly = readonly
+        self.tags = np.memmap(tags_path, dtype=np.uint32, mode=mode, shape=(num_slots,))
+        self.regrets = np.memmap(os.path.join(path, 'regrets.f32'), dtype=np.float32,
+                                 mode=mode, shape=(num_slots, NUM_ACTIONS))
+        self.strategy_sum = np.memmap(os.path.join(path, 'strategy.f32'), dtype=np.float32,
+                                      mode=mode, shape=(num_slots, NUM_ACTIONS))
+        self.collisions = 0
+
+    @staticmethod
+    def bytes_per_slot() -> int:
+        return 4 + 2 * 4 * NUM_ACTIONS
+
+    @property
+    def nbytes(self) -> int:
+        return self.num_slots * self.bytes_per_slot()
+
+    def slot(self, key: int) -> int:
+        """训练时取得信息集的槽位，必要时占用它"""
+        tags = self.tags
+        home = key % self.num_slots
+        tag = ((key >> 32) | 1) & 0xffffffff
+        for step in range(PROBES):
+            slot = (home + step) % self.num_slots
+            stored = tags[slot]
+            if stored == tag:
+                return slot
+            if not stored:
+                tags[slot] = tag
+                return slot
+        # Every probed slot holds another infoset: evict the one at home. Its
+        # regrets and strategy sums must not seed the newcomer
+        self.collisions += 1
+        self.regrets[home] = 0.0
+        self.strategy_sum[home] = 0.0
+        tags[home] = tag
+        return home
+
+    def lookup(self, key: int) -> Optional[int]:
+        """只读查找：信息集没有训练过时返回 None"""
+        home = key % self.num_slots
+        tag = ((key >> 32) | 1) & 0xffffffff
+        for step in range(PROBES):
+            slot = (home + step) % self.num_slots
+            stored = self.tags[slot]
+            if stored == tag:
+                return slot
+            if not stored:
+                return None
+        return None
+
+    def current_strategy(self, slot: int, codes: List[int]) -> np.ndarray:
+        # Regret matching over the legal actions
+        positive = np.maximum(self.regrets[slot, codes], 0.0)
+        total = positive.sum()
+        if total > 0:
+            return positive / total
+        return np.full(len(codes), 1.0 / len(codes))
+
+    def average_strategy(self, slot: int, codes: List[int]) -> np.ndarray:
+        weights = self.strategy_sum[slot, codes].astype(np.float64)
+        total = weights.sum()
+        if total > 0:
+            return weights / total
+        return np.full(len(codes), 1.0 / len(codes))
+
+    def touched(self) -> int:
+        return int(np.count_nonzero(self.tags))
+
+    def flush(self):
+        if not self.readonly:
+            self.tags.flush()
+            self.regrets.flush()
+            self.strategy_sum.flush()
+
+
+DEFAULT_CONFIG = {
+    'num_players': 2,
+    'stack': 200,
+    'small_blind': 1,
+    'max_raises': 2,
+    'preflop_buckets': 8,
+    'postflop_buckets': 10,
+    'bucket_samples': 128,
+}
+
+class CFRTrainer:
+    """外部采样 MCCFR，直接使用 PokerGame 的下注规则
+
+    表和配置都保存在 path 目录中；再次打开同一目录会沿用原来的配置并继续训练。
+    """
+    def __init__(self, path: str, num_slots: int = 1 << 22, **config):
+        self.path = path
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.config = meta['config']
+            self.iterations = meta['iterations']
+            collisions = meta.get('collisions', 0)
+        else:
+            unknown = set(config) - set(DEFAULT_CONFIG)
+            if unknown:
+                raise TypeError(f"未知的训练参数: {', '.join(sorted(unknown))}")
+            self.config = {**DEFAULT_CONFIG, **config}
+            self.iterations = 0
+            collisions = 0
+        self.table = InfosetTable(path, num_slots)
+        self.table.collisions = collisions
+        if not os.path.exists(meta_path):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """把表写回磁盘并原子地更新迭代次数和冲突计数"""
+        self.table.flush()
+        meta = {'config': self.config, 'iterations': self.iterations,
+                'num_slots': self.table.num_slots, 'collisions': self.table.collisions}
+        atomic_write(os.path.join(self.path, 'meta.json'),
+                     lambda f: json.dump(meta, f, indent=2), 'w')
+
+    def train(self, iterations: int, seed: Optional[int] = None, workers: int = 1,
+              checkpoint_every: int = 10000):
+        """训练 iterations 次，每 checkpoint_every 次保存一次
+
+        workers > 1 时各进程映射同一张表并行更新（不加锁），每轮结束后保存。
+        """
+        done = 0
+        seeds = iter(chunk_seeds(seed, -(-iterations // checkpoint_every) * max(1, workers)))
+        while done < iterations:
+            batch = min(checkpoint_every, iterations - done)
+            if workers > 1:
+                sizes = [batch // workers + (1 if k < batch % workers else 0) for k in range(workers)]
+                tasks = [(self.path, size, next(seeds), self.iterations + start)
+                         for size, start in zip(sizes, np.cumsum([0] + sizes[:-1]).tolist())]
+                self.table.flush()
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    self.table.collisions += sum(pool.map(_train_worker, tasks))
+            else:
+                self.run(batch, next(seeds), self.iterations)
+            self.iterations += batch
+            done += batch
+            self.checkpoint()
+
+    def run(self, iterations: int, seed: int, first_iteration: int = 0):
+        """在当前进程中训练，不更新迭代计数"""
+        cfg = self.config
+        n = cfg['num_players']
+        rng = np.random.default_rng(seed)
+        game = PokerGame(n, cfg['small_blind'], random.Random(int(rng.integers(1 << 62))))
+        game.initialize_game([f"p{i}" for i in range(n)], cfg['stack'])
+        bucketer = CardBucketer(cfg['preflop_buckets'], cfg['postflop_buckets'],
+                                cfg['bucket_samples'], rng)
+        for it in range(first_iteration, first_iteration + iterations):
+            for player in game.players:
+                player.chips = cfg['stack']
+            game.dealer_idx = it % n
+            game.start_new_hand()
+            buckets = bucketer.deal_buckets(game)
+            self._traverse(game, it % n, buckets, FNV_OFFSET, 0, rng)
+
+    def _traverse(self, game: PokerGame, traverser: int, buckets: List[List[int]],
+                  history: int, raises: int, rng: np.random.Generator) -> float:
+        st = game.state
+        while game.is_round_complete():
+            if st.round_state == 'river' or st.folded.count(0) == 1:
+                game.award_pot()
+                return float(st.chips[traverser] - self.config['stack'])
+            game.deal_next_street()
+            history = _mix(history, STREET_MARK + STREETS.index(st.round_state))
+            raises = 0
+
+        i = st.current_player_idx
+        street = STREETS.index(st.round_state)
+        key = infoset_key(history, street, buckets[i][street], (i - st.dealer_idx) % st.num_players)
+        actions = abstract_actions(game, raises < self.config['max_raises'])
+        codes = [code for code, _, _ in actions]
+        table = self.table
+        slot = table.slot(key)
+        strategy = table.current_strategy(slot, codes)
+
+        if i == traverser:
+            snapshot = game.snapshot()
+            utils = np.empty(len(actions))
+            for k, (code, action, amount) in enumerate(actions):
+                if k:
+                    game.restore(snapshot)
+                game.process_action(action, amount)
+                utils[k] = self._traverse(game, traverser, buckets, _mix(history, code),
+                                          raises + (code > PASSIVE), rng)
+            value = float(strategy @ utils)
+            table.regrets[slot, codes] += (utils - value).astype(np.float32)
+            return value
+
+        # Opponent node: accumulate the average strategy and sample one action
+        table.strategy_sum[slot, codes] += strategy.astype(np.float32)
+        code, action, amount = actions[rng.choice(len(actions), p=strategy)]
+        game.process_action(action, amount)
+        return self._traverse(game, traverser, buckets, _mix(history, code),
+                              raises + (code > PASSIVE), rng)
+
+def _train_worker(args) -> int:
+    path, iterations, seed, first_iteration = args
+    trainer = CFRTrainer(path)
+    # Report only this worker's collisions; the total lives in the parent's meta
+    trainer.table.collisions = 0
+    trainer.run(iterations, seed, first_iteration)
+    trainer.table.flush()
+    return trainer.table.collisions
+
+
+class CFRBot(Bot):
+    """按训练好的平均策略行动；需要先 attach 到牌局以跟踪下注历史"""
+    def __init__(self, name: str, path: str, rng: Optional[random.Random] = None):
+        super().__init__(name)
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.config = json.load(f)['config']
+        self.table = InfosetTable(path, readonly=True)
+        self.rng = rng or random.Random()
+        self.bucketer = CardBucketer(self.config['preflop_buckets'],
+                                     self.config['postflop_buckets'],
+                                     self.config['bucket_samples'],
+                                     np.random.default_rng(self.rng.getrandbits(64)))
+        self.game: Optional[PokerGame] = None
+        self._history = FNV_OFFSET
+        self._raises = 0
+        self._before: Optional[Sequence[int]] = None
+
+    def attach(self, game: PokerGame):
+        self.game = game
+        game.add_listener(self.on_game_event)
+
+    def on_game_event(self, event: str, data: dict):
+        st = self.game.state
+        if event == 'hand_start':
+            self._history = FNV_OFFSET
+            self._raises = 0
+        elif event == 'street':
+            self._history = _mix(self._history, STREET_MARK + STREETS.index(data['round_state']))
+            self._raises = 0
+        elif event in ('bet', 'check', 'fold'):
+            code = PASSIVE if event != 'fold' else 0
+            if event == 'bet' and data['action'] == 'raise' and self._before is not None:
+                code = translate_raise(data['amount'], *self._before, self.game.big_blind)
+                self._raises += 1
+            self._history = _mix(self._history, code)
+        if event in ('hand_start', 'turn'):
+            # Betting state before the next action, for translating raise sizes
+            i = st.current_player_idx
+            self._before = (st.pot, st.current_bet, st.bets[i], st.chips[i])
+
+    def act(self, game: PokerGame, player: Player, valid_actions: Dict[str, bool]) -> Action:
+        st = game.state
+        street = STREETS.index(st.round_state)
+        if street == 0:
+            bucket = self.bucketer.preflop(player.cards)
+        else:
+            bucket = self.bucketer.postflop(player.cards, game.community_cards)
+        key = infoset_key(self._history, street, bucket, (player._idx - st.dealer_idx) % st.num_players)
+        actions = abstract_actions(game, self._raises < self.config['max_raises'])
+        slot = self.table.lookup(key)
+        if slot is None:
+            # Unseen situation: take the passive option
+            return next(((a, amt) for code, a, amt in actions if code == PASSIVE), ('fold', None))
+        strategy = self.table.average_strategy(slot, [code for code, _, _ in actions])
+        _, action, amount = actions[self.rng.choices(range(len(actions)), weights=strategy)[0]]
+        return action, amount
\ No newline at end of file
@@ -0,0 +1,186 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from .evaluator import CARD_KEY, CARD_SUIT_MASK, get_evaluator, to_indices
+from .poker_game import PokerGame
+
+def monte_carlo_equity(hands: Sequence[Sequence[int]], board: Sequence[int] = (),
+                       samples: int = 1000,
+                       rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """对每名玩家随机发完剩余公共牌，返回 (获胜概率, 平分概率) 数组"""
+    if rng is None:
+        rng = np.random.default_rng()
+    hole = np.array([to_indices(h) for h in hands], dtype=np.int64)  # (P, 2)
+    known_board = to_indices(board)
+    remaining = np.setdiff1d(np.arange(52), np.concatenate([hole.ravel(), known_board]))
+    ranks = _runout_ranks(hole, known_board, remaining, samples, rng)
+    return _win_tie(ranks)
+
+def _runout_ranks(hole: np.ndarray, known_board: np.ndarray, remaining: np.ndarray,
+                  samples: int, rng: np.random.Generator) -> np.ndarray:
+    # Rank every player's hand on `samples` random runouts drawn from `remaining`
+    num_players = len(hole)
+    missing = 5 - len(known_board)
+    if missing == 0:
+        samples = 1
+
+    # Draw `missing` distinct cards per sample by partially sorting random keys
+    if missing:
+        order = rng.random((samples, len(remaining))).argpartition(missing - 1, axis=1)
+        runouts = remaining[order[:, :missing]]
+    else:
+        runouts = np.empty((samples, 0), dtype=np.int64)
+    boards = np.concatenate([np.broadcast_to(known_board, (samples, len(known_board))), runouts],
+                            axis=1)  # (S, 5)
+
+    cards = np.concatenate([np.broadcast_to(hole[None, :, :], (samples, num_players, 2)),
+                            np.broadcast_to(boards[:, None, :], (samples, num_players, 5))],
+                           axis=2)
+    return get_evaluator().evaluate_batch(cards.reshape(-1, 7)).reshape(samples, num_players)
+
+def _win_tie(ranks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # ranks is (boards, players); lower ranks are better
+    best = ranks == ranks.min(axis=1, keepdims=True)
+    winners = best.sum(axis=1, keepdims=True)
+    win = (best & (winners == 1)).mean(axis=0)
+    tie = (best & (winners > 1)).mean(axis=0)
+    return win, tie
+
+def _completions(remaining: np.ndarray, missing: int) -> np.ndarray:
+    # Every unordered set of `missing` cards from `remaining`, shape (C, missing)
+    if missing == 0:
+        return np.empty((1, 0), dtype=np.int64)
+    if missing == 1:
+        return remaining[:, None]
+    first, second = np.triu_indices(len(remaining), k=1)
+    return np.stack([remaining[first], remaining[second]], axis=1)
+
+def exact_equity(hands: Sequence[Sequence[int]],
+                 board: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """翻牌后枚举所有转牌、河牌组合，返回精确的 (获胜概率, 平分概率) 数组"""
+    known_board = to_indices(board)
+    if len(known_board) < 3:
+        raise ValueError("精确枚举只支持翻牌及之后的局面")
+    hole = np.array([to_indices(h) for h in hands], dtype=np.int64)  # (P, 2)
+    remaining = np.setdiff1d(np.arange(52), np.concatenate([hole.ravel(), known_board]))
+    runouts = _completions(remaining, 5 - len(known_board))  # (C, missing)
+
+    # Key sums and per-suit rank masks are additive: evaluate each player's
+    # known cards once, each runout once, and combine them per board
+    known = np.concatenate([hole, np.broadcast_to(known_board, (len(hole), len(known_board)))],
+                           axis=1)
+    player_keys = CARD_KEY[known].sum(axis=1)                   # (P,)
+    player_masks = CARD_SUIT_MASK[known].sum(axis=1)            # (P, 4)
+    runout_keys = CARD_KEY[runouts].sum(axis=1)                 # (C,)
+    runout_masks = CARD_SUIT_MASK[runouts].sum(axis=1)          # (C, 4)
+
+    keys = runout_keys[:, None] + player_keys[None, :]          # (C, P)
+    masks = runout_masks[:, None, :] | player_masks[None, :, :]  # (C, P, 4)
+    return _win_tie(get_evaluator().evaluate_keys(keys, masks))
+
+def equity_vs_random(hole: Sequence[int], board: Sequence[int] = (), num_opponents: int = 1,
+                     samples: int = 2000, rng: Optional[np.random.Generator] = None) -> float:
+    """一手牌对抗 num_opponents 个随机手牌的胜率（平分按人数折算）"""
+    if rng is None:
+        rng = np.random.default_rng()
+    hero = to_indices(hole)
+    known_board = to_indices(board)
+    missing = 5 - len(known_board)
+    remaining = np.setdiff1d(np.arange(52), np.concatenate([hero, known_board]))
+
+    # One draw per sample covers every opponent's hole cards and the runout
+    needed = 2 * num_opponents + missing
+    # argpartition picks a uniform set but not a uniform order; sort the picks
+    # by key so the split between opponents and board is unbiased too
+    keys = rng.random((samples, len(remaining)))
+    order = keys.argpartition(needed - 1, axis=1)[:, :needed]
+    order = np.take_along_axis(order, np.take_along_axis(keys, order, axis=1).argsort(axis=1), axis=1)
+    drawn = remaining[order]
+    opponents = drawn[:, :2 * num_opponents].reshape(samples, num_opponents, 2)
+    boards = np.concatenate([np.broadcast_to(known_board, (samples, len(known_board))),
+                             drawn[:, 2 * num_opponents:]], axis=1)
+
+    evaluator = get_evaluator()
+    hero_ranks = evaluator.evaluate_batch(np.concatenate(
+        [np.broadcast_to(hero, (samples, 2)), boards], axis=1))
+    opp_cards = np.concatenate([opponents,
+                                np.broadcast_to(boards[:, None, :], (samples, num_opponents, 5))],
+                               axis=2)
+    opp_ranks = evaluator.evaluate_batch(opp_cards.reshape(-1, 7)).reshape(samples, num_opponents)
+
+    best_opp = opp_ranks.min(axis=1)
+    ties = (opp_ranks == hero_ranks[:, None]).sum(axis=1)
+    share = np.where(hero_ranks < best_opp, 1.0,
+                     np.where(hero_ranks == best_opp, 1.0 / (ties + 1), 0.0))
+    return float(share.mean())
+
+def equity_vs_random_batch(hole: np.ndarray, board: np.ndarray, num_opponents: np.ndarray,
+                           samples: int = 200,
+                           rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """equity_vs_random 的批量版本，每行一个局面，一次算完
+
+    hole (N, 2) 和 board (N, 5) 为 0..51 下标，未发出的公共牌填 -1；
+    num_opponents (N,) 为每行的对手人数（不超过 20）。
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    hole = np.asarray(hole, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64)
+    num_opponents = np.asarray(num_opponents, dtype=np.int64)
+    result = np.empty(len(hole))
+    if not len(hole):
+        return result
+    max_opp = int(num_opponents.max())
+    needed = 2 * max_opp + 5
+    evaluator = get_evaluator()
+
+    block = max(1, (1 << 22) // (samples * 52))
+    for start in range(0, len(hole), block):
+        h, b = hole[start:start + block], board[start:start + block]
+        rows = len(h)
+        # Random keys with the known cards pushed past every unknown one, so
+        # the `needed` smallest are distinct undealt cards. argpartition leaves
+        # them in no particular order and rows may use only some of them, so
+        # sort them by key to keep every slot uniformly random.
+        keys = rng.random((rows, samples, 52))
+        known = np.concatenate([h, b], axis=1)
+        r, c = np.nonzero(known >= 0)
+        keys[r, :, known[r, c]] = 2.0
+        drawn = keys.argpartition(needed - 1, axis=2)[:, :, :needed]
+        drawn = np.take_along_axis(drawn, np.take_along_axis(keys, drawn, axis=2).argsort(axis=2),
+                                   axis=2)
+
+        boards = np.where(b[:, None, :] >= 0, b[:, None, :], drawn[:, :, 2 * max_opp:])
+        board_key = CARD_KEY[boards].sum(axis=2)              # (rows, S)
+        board_mask = CARD_SUIT_MASK[boards].sum(axis=2)       # (rows, S, 4)
+        hero_ranks = evaluator.evaluate_keys(CARD_KEY[h].sum(axis=1)[:, None] + board_key,
+                                             CARD_SUIT_MASK[h].sum(axis=1)[:, None] + board_mask)
+        opponents = drawn[:, :, :2 * max_opp].reshape(rows, samples, max_opp, 2)
+        opp_ranks = evaluator.evaluate_keys(
+            CARD_KEY[opponents].sum(axis=3) + board_key[:, :, None],
+            CARD_SUIT_MASK[opponents].sum(axis=3) + board_mask[:, :, None])
+        # Seats beyond a row's opponent count never beat anyone
+        absent = np.arange(max_opp) >= num_opponents[start:start + block, None]
+        opp_ranks = np.where(absent[:, None, :], np.iinfo(np.int32).max, opp_ranks)
+
+        best_opp = opp_ranks.min(axis=2)
+        ties = (opp_ranks == hero_ranks[:, :, None]).sum(axis=2)
+        share = np.where(hero_ranks < best_opp, 1.0,
+                         np.where(hero_ranks == best_opp, 1.0 / (ties + 1), 0.0))
+        result[start:start + block] = share.mean(axis=1)
+    return result
+
+def game_equity(game: PokerGame, samples: int = 1000,
+                rng: Optional[np.random.Generator] = None, exact: bool = False) -> List[tuple]:
+    """计算当前局面中每名未弃牌玩家的 (玩家, 获胜概率, 平分概率)
+
+    exact 为 True 时（需已发出翻牌）枚举全部剩余公共牌，不再抽样。
+    """
+    players = [p for p in game.players if not p.is_folded and len(p.cards) == 2]
+    if not players:
+        return []
+    hands = [p.cards for p in players]
+    if exact:
+        win, tie = exact_equity(hands, game.community_cards)
+    else:
+        win, tie = monte_carlo_equity(hands, game.community_cards, samples, rng)
+    return [(player, float(w), float(t)) for player, w, t in zip(players, win, tie)]
\ No newline at end of file
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+import os
+import numpy as np
+from .cache import atomic_write
+from .equity import equity_vs_random
+from .evaluator import CARD_TO_INDEX, INDEX_TO_CARD
+
+Key = Tuple[Tuple[int, ...], Tuple[int, ...], int]
+
+# On disk each key is one row: 2 hole cards, 5 board cards (-1 when not dealt)
+# and the number of opponents, all 0..51 card indices
+KEY_COLUMNS = 8
+
+def canonical_key(hole: Sequence[int], board: Sequence[int], num_opponents: int) -> Key:
+    """花色同构的规范形式：按每种花色在手牌和公共牌中的点数给花色重新编号"""
+    hole_idx = [CARD_TO_INDEX[c] for c in hole]
+    board_idx = [CARD_TO_INDEX[c] for c in board]
+    # Suits with equal signatures are interchangeable, so ties do not matter
+    signatures = [(sorted(c // 4 for c in hole_idx if c % 4 == suit),
+                   sorted(c // 4 for c in board_idx if c % 4 == suit))
+                  for suit in range(4)]
+    relabel = [0] * 4
+    for new_suit, suit in enumerate(sorted(range(4), key=signatures.__getitem__, reverse=True)):
+        relabel[suit] = new_suit
+    return (tuple(sorted((c // 4) * 4 + relabel[c % 4] for c in hole_idx)),
+            tuple(sorted((c // 4) * 4 + relabel[c % 4] for c in board_idx)),
+            num_opponents)
+
+class EquityCache:
+    """按规范形式缓存胜率，内存中为有界 LRU，可选的磁盘存储在首次查询时加载
+
+    磁盘存储是只含数值数组的 .npz 文件，加载时不会执行任何代码。
+    """
+    def __init__(self, max_entries: int = 100000, path: Optional[str] = None,
+                 samples: int = 2000):
+        self.max_entries = max_entries
+        self.path = path
+        self.samples = samples
+        self._entries: 'OrderedDict[Key, float]' = OrderedDict()
+        self._disk: Optional[Dict[Key, float]] = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def equity(self, hole: Sequence[int], board: Sequence[int] = (), num_opponents: int = 1) -> float:
+        key = canonical_key(hole, board, num_opponents)
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = self._load_disk().get(key)
+        if value is not None:
+            self.disk_hits += 1
+        else:
+            # Compute on the canonical hand so every isomorphic spot shares one sample
+            value = equity_vs_random([int(INDEX_TO_CARD[c]) for c in key[0]],
+                                     [int(INDEX_TO_CARD[c]) for c in key[1]],
+                                     num_opponents, self.samples)
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Key, value: float):
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            old_key, old_value = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.path:
+                # The disk store is unbounded, so evicted results are kept for save()
+                self._load_disk()[old_key] = old_value
+
+    def _load_disk(self) -> Dict[Key, float]:
+        if self._disk is None:
+            self._disk = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with np.load(self.path, allow_pickle=False) as data:
+                        keys, values = data['keys'].tolist(), data['equity'].tolist()
+                except (OSError, ValueError, KeyError):
+                    # Unreadable or from an older format: start a new store
+                    return self._disk
+                for row, value in zip(keys, values):
+                    hole = tuple(c for c in row[:2] if c >= 0)
+                    board = tuple(c for c in row[2:7] if c >= 0)
+                    self._disk[(hole, board, row[7])] = value
+        return self._disk
+
+    def save(self):
+        """把内存中的条目合并进磁盘存储"""
+        if not self.path:
+            return
+        disk = self._load_disk()
+        disk.update(self._entries)
+        keys = np.full((len(disk), KEY_COLUMNS), -1, dtype=np.int8)
+        for row, (hole, board, num_opponents) in zip(keys, disk):
+            row[:len(hole)] = hole
+            row[2:2 + len(board)] = board
+            row[7] = num_opponents
+        equity = np.fromiter(disk.values(), dtype=np.float64, count=len(disk))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atomic_write(self.path, lambda f: np.savez(f, keys=keys, equity=equity))
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
\ No newline at end of file
@@ -0,0 +1,191 @@
+from typing import List, Optional, Sequence
+import itertools
+import os
+import numpy as np
+from .cache import CACHE_DIR, atomic_write
+from .cards import FULL_DECK
+
+# Per-rank keys whose sums are unique for every 7-card rank multiset, so the
+# sum of the seven card keys indexes the non-flush table directly.
+RANK_KEYS = [0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181]
+RANK_KEY_BITS = 23  # largest 7-card key sum is 7825759 < 2**23
+RANK_KEY_MASK = (1 << RANK_KEY_BITS) - 1
+SUIT_COUNT_BITS = 3  # up to 7 cards per suit
+
+SUIT_BITS = [1, 2, 4, 8]  # treys suit bits: s, h, d, c
+
+TABLE_VERSION = 1
+
+
+# treys card ints for each 0..51 index (rank * 4 + suit)
+INDEX_TO_CARD = np.array(FULL_DECK, dtype=np.int64)
+CARD_RANK = np.arange(52, dtype=np.int64) // 4
+CARD_SUIT = np.arange(52, dtype=np.int64) % 4
+CARD_RANK_BIT = (1 << CARD_RANK).astype(np.int64)
+CARD_KEY = (np.array(RANK_KEYS, dtype=np.int64)[CARD_RANK]
+            + (1 << (RANK_KEY_BITS + SUIT_COUNT_BITS * CARD_SUIT)))
+# Rank bit in the card's own suit column; summing over cards gives per-suit rank masks
+CARD_SUIT_MASK = np.zeros((52, 4), dtype=np.int64)
+CARD_SUIT_MASK[np.arange(52), CARD_SUIT] = CARD_RANK_BIT
+
+
+# Same keys indexed by treys card int, for the scalar path
+_KEY_BY_CARD = {int(INDEX_TO_CARD[i]): int(CARD_KEY[i]) for i in range(52)}
+CARD_TO_INDEX = {int(INDEX_TO_CARD[i]): i for i in range(52)}
+
+
+def to_indices(cards: Sequence[int]) -> np.ndarray:
+    """treys 整数牌 -> 0..51 的下标数组"""
+    return np.array([CARD_TO_INDEX[c] for c in cards], dtype=np.int64)
+
+
+class LookupEvaluator:
+    """基于查表的7张牌评估器，结果与 treys 的 Evaluator.evaluate 一致（越小越强）
+
+    查找表只在第一次使用时生成，之后保存到磁盘并以内存映射方式加载。
+    """
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.nonflush_table, self.flush_table = self._load_tables()
+        self._fallback = None
+
+    def _table_paths(self):
+        return (os.path.join(self.cache_dir, f'nonflush7_v{TABLE_VERSION}.npy'),
+                os.path.join(self.cache_dir, f'flush_v{TABLE_VERSION}.npy'))
+
+    def _load_tables(self):
+        nonflush_path, flush_path = self._table_paths()
+        try:
+            return (np.load(nonflush_path, mmap_mode='r'),
+                    np.load(flush_path, mmap_mode='r'))
+        except (OSError, ValueError):
+            pass
+
+        nonflush_table, flush_table = self._build_tables()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, table in ((nonflush_path, nonflush_table), (flush_path, flush_table)):
+                # Concurrent processes must never map a partial file
+                atomic_write(path, lambda f: np.save(f, table))
+            return (np.load(nonflush_path, mmap_mode='r'),
+                    np.load(flush_path, mmap_mode='r'))
+        except OSError:
+            # Read-only home directory: keep the freshly built tables in memory
+            return nonflush_table, flush_table
+
+    @staticmethod
+    def _build_tables():
+        # treys is only needed to generate the tables once
+        from treys import Card
+        from treys.lookup import LookupTable
+        lookup = LookupTable()
+        primes = Card.PRIMES
+
+        # Best non-flush rank of every 5-card rank multiset, keyed by key sum
+        best = {}
+        for ranks in itertools.combinations_with_replacement(range(13), 5):
+            if any(ranks.count(r) > 4 for r in ranks):
+                continue
+            product = 1
+            for r in ranks:
+                product *= primes[r]
+            best[sum(RANK_KEYS[r] for r in ranks)] = lookup.unsuited_lookup[product]
+
+        # Extend to 6 and then 7 cards: best of the multisets one card smaller
+        for size in (6, 7):
+            bigger = {}
+            for ranks in itertools.combinations_with_replacement(range(13), size):
+                if any(ranks.count(r) > 4 for r in ranks):
+                    continue
+                key = sum(RANK_KEYS[r] for r in ranks)
+                bigger[key] = min(best[key - RANK_KEYS[r]] for r in set(ranks))
+            best = bigger
+
+        nonflush_table = np.zeros(max(best) + 1, dtype=np.uint16)
+        keys = np.fromiter(best.keys(), dtype=np.int64, count=len(best))
+        nonflush_table[keys] = np.fromiter(best.values(), dtype=np.uint16, count=len(best))
+
+        # Best flush for every suited rank bitmask with 5 to 7 bits set
+        flush_table = np.zeros(1 << 13, dtype=np.uint16)
+        for size in (5, 6, 7):
+            for ranks in itertools.combinations(range(13), size):
+                mask = 0
+                for r in ranks:
+                    mask |= 1 << r
+                flush_table[mask] = min(
+                    lookup.flush_lookup[Card.prime_product_from_rankbits(
+                        sum(1 << r for r in sub))]
+                    for sub in itertools.combinations(ranks, 5))
+
+        return nonflush_table, flush_table
+
+    def evaluate_batch(self, cards: np.ndarray) -> np.ndarray:
+        """评估形状为 (N, 7) 的牌下标数组，返回每手牌的等级"""
+        cards = np.asarray(cards, dtype=np.int64)
+        keys = CARD_KEY[cards].sum(axis=1)
+        ranks = self.nonflush_table[keys & RANK_KEY_MASK].astype(np.int32)
+
+        # At most one suit can hold five of seven cards
+        suit_counts = keys >> RANK_KEY_BITS
+        flush_suit = np.full(len(keys), -1, dtype=np.int64)
+        for suit in range(4):
+            count = (suit_counts >> (SUIT_COUNT_BITS * suit)) & 0x7
+            flush_suit[count >= 5] = suit
+
+        rows = np.flatnonzero(flush_suit >= 0)
+        if len(rows):
+            flush_cards = cards[rows]
+            suited = CARD_SUIT[flush_cards] == flush_suit[rows, None]
+            masks = np.where(suited, CARD_RANK_BIT[flush_cards], 0).sum(axis=1)
+            ranks[rows] = np.minimum(ranks[rows], self.flush_table[masks])
+        return ranks
+
+    def evaluate_keys(self, keys: np.ndarray, suit_masks: np.ndarray) -> np.ndarray:
+        """由7张牌的键之和与各花色的点数掩码求等级
+
+        keys 与 suit_masks[..., 4] 可以由部分牌的结果逐张累加得到，
+        便于在枚举公共牌时复用已经算好的部分。
+        """
+        ranks = self.nonflush_table[keys & RANK_KEY_MASK].astype(np.int32)
+        suit_counts = keys >> RANK_KEY_BITS
+        for suit in range(4):
+            flush = ((suit_counts >> (SUIT_COUNT_BITS * suit)) & 0x7) >= 5
+            if flush.any():
+                ranks[flush] = np.minimum(ranks[flush],
+                                          self.flush_table[suit_masks[..., suit][flush]])
+        return ranks
+
+    def evaluate(self, hand: List[int], board: List[int]) -> int:
+        """与 treys 的 Evaluator.evaluate 用法相同；7张牌时直接查表"""
+        cards = hand + board
+        if len(cards) != 7:
+            if self._fallback is None:
+                from treys import Evaluator
+                self._fallback = Evaluator()
+            return self._fallback.evaluate(hand, board)
+
+        key = 0
+        for card in cards:
+            key += _KEY_BY_CARD[card]
+        rank = int(self.nonflush_table[key & RANK_KEY_MASK])
+
+        suit_counts = key >> RANK_KEY_BITS
+        for suit in range(4):
+            if (suit_counts >> (SUIT_COUNT_BITS * suit)) & 0x7 >= 5:
+                suit_bit = SUIT_BITS[suit] << 12
+                mask = 0
+                for card in cards:
+                    if card & suit_bit:
+                        mask |= card >> 16
+                return min(rank, int(self.flush_table[mask]))
+        return rank
+
+
+_evaluator: Optional[LookupEvaluator] = None
+
+def get_evaluator() -> LookupEvaluator:
+    # The lookup tables are large, so map them once per process
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = LookupEvaluator()
+    return _evaluator
\ No newline at end of file
@@ -0,0 +1,172 @@
+from typing import Iterator, List, Optional, Tuple
+import os
+import struct
+import numpy as np
+from .poker_game import PokerGame
+
+# Every record, including the file header, is one fixed 16-byte struct:
+# type (u8), seat (u8), flags (u16), a, b, c (i32). Cards are treys ints.
+RECORD = struct.Struct('<BBHiii')
+RECORD_DTYPE = np.dtype([('type', 'u1'), ('seat', 'u1'), ('flags', '<u2'),
+                         ('a', '<i4'), ('b', '<i4'), ('c', '<i4')])
+MAGIC = b'PPHH'
+VERSION = 1
+HEADER = MAGIC + struct.pack('<I', VERSION) + bytes(8)
+
+# The hand number is the record's position in the .idx file, so it has no field
+# to overflow however long the log grows
+HAND_START = 1  # seat=dealer, flags=num_players, a=0 (unused), b=small blind, c=ante
+DEAL = 2        # seat, a/b=hole cards
+BLIND = 3       # seat, a=amount
+ACTION = 4      # seat, flags=action code, a=player's bet after the action, b=pot
+BOARD = 5       # flags=street code, a/b/c=new cards (0 when unused)
+SHOWDOWN = 6    # seat, a=hand rank (lower is better)
+AWARD = 7       # seat, a=amount won
+ANTE = 8        # seat, a=amount
+
+ACTIONS = ['check', 'call', 'raise', 'fold']
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+STREETS = ['preflop', 'flop', 'turn', 'river']
+STREET_CODES = {name: code for code, name in enumerate(STREETS)}
+
+class HandHistoryWriter:
+    """订阅 PokerGame 事件，把每手牌以定长二进制记录追加到日志文件
+
+    同时维护一个 .idx 索引文件（每手牌起始记录号，u64），读取时无需扫描整个日志。
+    """
+    def __init__(self, path: str):
+        self.path = path
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab')
+        if new_file:
+            self._file.write(HEADER)
+        self._index = open(path + '.idx', 'ab')
+        self._next_record = self._file.tell() // RECORD.size - 1
+        self.hands_written = os.path.getsize(path + '.idx') // 8
+        self._pending: List[bytes] = []
+        self.game: Optional[PokerGame] = None
+
+    def attach(self, game: PokerGame):
+        self.game = game
+        game.add_listener(self.on_game_event)
+
+    def detach(self):
+        if self.game is not None:
+            self.game.remove_listener(self.on_game_event)
+            self.game = None
+
+    def on_game_event(self, event: str, data: dict):
+        pack = RECORD.pack
+        pending = self._pending
+        if event == 'hand_start':
+            self.flush()
+            pending.append(pack(HAND_START, data['dealer'], self.game.num_players,
+                                0, self.game.small_blind, self.game.ante))
+        elif event == 'deal':
+            cards = data['cards']
+            pending.append(pack(DEAL, data['player'], 0, cards[0], cards[1], 0))
+        elif event == 'ante':
+            pending.append(pack(ANTE, data['player'], 0, data['amount'], 0, 0))
+        elif event == 'blind':
+            pending.append(pack(BLIND, data['player'], 0, data['amount'], 0, 0))
+        elif event == 'bet':
+            pending.append(pack(ACTION, data['player'], ACTION_CODES[data['action']],
+                                data['amount'], data['pot'], 0))
+        elif event in ('check', 'fold'):
+            pending.append(pack(ACTION, data['player'], ACTION_CODES[event], 0, 0, 0))
+        elif event == 'street':
+            count = {'flop': 3, 'turn': 1, 'river': 1}[data['round_state']]
+            cards = (data['board'][-count:] + [0, 0])[:3]
+            pending.append(pack(BOARD, 0, STREET_CODES[data['round_state']], *cards))
+        elif event == 'showdown':
+            for seat, score in data['results']:
+                pending.append(pack(SHOWDOWN, seat, 0, score, 0, 0))
+        elif event == 'award':
+            for seat, amount in data['payouts']:
+                pending.append(pack(AWARD, seat, 0, amount, 0, 0))
+            self.flush()
+
+    def flush(self):
+        """把当前这手牌写入文件"""
+        if not self._pending:
+            return
+        self._index.write(struct.pack('<Q', self._next_record))
+        self._file.write(b''.join(self._pending))
+        self._next_record += len(self._pending)
+        self.hands_written += 1
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self.detach()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class HandHistoryReader:
+    """以内存映射方式读取手牌日志，可直接定位到任意一手牌"""
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} 不是手牌日志文件")
+        num_records = os.path.getsize(path) // RECORD.size - 1
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=RECORD.size,
+                                 shape=(num_records,)) if num_records else \
+            np.empty(0, dtype=RECORD_DTYPE)
+
+        index_path = path + '.idx'
+        if os.path.exists(index_path) and os.path.getsize(index_path):
+            self.index = np.memmap(index_path, dtype='<u8', mode='r')
+        else:
+            # No index: locate hand starts with one vectorized pass
+            self.index = np.flatnonzero(self.records['type'] == HAND_START).astype('<u8')
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def hand_records(self, hand: int) -> np.ndarray:
+        start = int(self.index[hand])
+        end = int(self.index[hand + 1]) if hand + 1 < len(self.index) else len(self.records)
+        return self.records[start:end]
+
+    def replay(self, hand: int) -> Iterator[Tuple[str, dict]]:
+        """按原顺序还原一手牌的事件，事件名与数据格式与 PokerGame 发出的一致（不含 turn 事件）"""
+        board: List[int] = []
+        results: List[Tuple[int, int]] = []
+        payouts: List[Tuple[int, int]] = []
+        for rtype, seat, flags, a, b, c in self.hand_records(hand).tolist():
+            # One record per seat on disk; PokerGame sends one event per showdown and award
+            if results and rtype != SHOWDOWN:
+                yield 'showdown', {'results': results}
+                results = []
+            if rtype == HAND_START:
+                yield 'hand_start', {'dealer': seat, 'num_players': flags,
+                                     'hand': hand, 'small_blind': b, 'ante': c}
+            elif rtype == DEAL:
+                yield 'deal', {'player': seat, 'cards': [a, b]}
+            elif rtype == ANTE:
+                yield 'ante', {'player': seat, 'amount': a}
+            elif rtype == BLIND:
+                yield 'blind', {'player': seat, 'amount': a}
+            elif rtype == ACTION:
+                action = ACTIONS[flags]
+                if action in ('call', 'raise'):
+                    yield 'bet', {'player': seat, 'action': action, 'amount': a, 'pot': b}
+                else:
+                    yield action, {'player': seat}
+            elif rtype == BOARD:
+                board = board + [x for x in (a, b, c) if x]
+                yield 'street', {'round_state': STREETS[flags], 'board': board}
+            elif rtype == SHOWDOWN:
+                results.append((seat, a))
+            elif rtype == AWARD:
+                payouts.append((seat, a))
+        if results:
+            yield 'showdown', {'results': results}
+        if payouts:
+            yield 'award', {'payouts': payouts}
\ No newline at end of file
@@ -0,0 +1,195 @@
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .poker_game import PokerGame
+from .ranges import CLASS_COMBOS, COMBO_BITS, COMBO_CLASS, COMBOS, HAND_CLASSES, CardsLike, \
+    _as_range, preflop_matrix
+
+# Above this many players the subset DP gets too large and icm() samples instead
+EXACT_MAX_PLAYERS = 16
+MC_SAMPLES = 20000
+# Cap on the (rows, samples, players) keys array built per Monte Carlo block
+MC_BLOCK = 1 << 22
+
+_layers_cache: Dict[Tuple[int, int], list] = {}
+
+def _layers(num_players: int, depth: int) -> list:
+    # Subsets of the players grouped by size 0..depth-1. For each size:
+    # members (M, n) bool and prev (M, n), the position of mask without
+    # player j in the previous layer (-1 when j is not in the mask), plus
+    # members and its complement as floats for the matrix products
+    key = (num_players, depth)
+    if key in _layers_cache:
+        return _layers_cache[key]
+    layers = []
+    previous: Dict[int, int] = {}
+    for size in range(depth):
+        masks = [sum(1 << j for j in subset) for subset in combinations(range(num_players), size)]
+        members = np.array([[(mask >> j) & 1 for j in range(num_players)] for mask in masks],
+                           dtype=bool).reshape(len(masks), num_players)
+        prev = np.array([[previous.get(mask ^ (1 << j), -1) if (mask >> j) & 1 else -1
+                          for j in range(num_players)] for mask in masks],
+                        dtype=np.int64).reshape(len(masks), num_players)
+        layers.append((members, prev, members.astype(np.float64), (~members).astype(np.float64)))
+        previous = {mask: i for i, mask in enumerate(masks)}
+    _layers_cache[key] = layers
+    return layers
+
+def _icm_exact(stacks: np.ndarray, paid: np.ndarray) -> np.ndarray:
+    # Malmuth-Harville by dynamic programming over the set of players already
+    # placed: f[m] is the probability that exactly the players in m take the
+    # top |m| places, and g[m] = f[m] / chips left outside m
+    rows, num_players = stacks.shape
+    total = stacks.sum(axis=1, keepdims=True)
+    values = np.zeros_like(stacks)
+    g = None
+    depth = len(np.trim_zeros(paid, 'b'))
+    for size, (members, prev, inside, outside) in enumerate(_layers(num_players, depth)):
+        if size == 0:
+            f = np.ones((rows, 1))
+        else:
+            f = np.zeros((rows, len(members)))
+            for j in range(num_players):
+                has_j = members[:, j]
+                f[:, has_j] += g[:, prev[has_j, j]] * stacks[:, j:j + 1]
+        left = total - stacks @ inside.T
+        g = np.divide(f, left, out=np.zeros_like(f), where=left > 0)
+        # P(j takes place size + 1) = sum over m without j of f[m] * s_j / left[m]
+        values += paid[size] * stacks * (g @ outside)
+    return values
+
+def _icm_monte_carlo(stacks: np.ndarray, paid: np.ndarray, samples: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    # Sorting exponential clocks with rate s_j draws finishing orders with the
+    # same Malmuth-Harville probabilities: the winner is the first to ring
+    rows, num_players = stacks.shape
+    values = np.empty_like(stacks)
+    block = max(1, MC_BLOCK // (samples * num_players))
+    for start in range(0, rows, block):
+        s = stacks[start:start + block]
+        with np.errstate(divide='ignore'):
+            clocks = rng.standard_exponential((len(s), samples, num_players)) / s[:, None, :]
+        places = clocks.argsort(axis=2).argsort(axis=2)
+        values[start:start + block] = paid[places].mean(axis=1)
+    return values
+
+def icm(stacks, payouts: Sequence[float], samples: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """独立筹码模型（ICM）：按剩余名次的奖金表把每名玩家的筹码换算成奖金期望
+
+    stacks 可以是一个局面（一维）或多个局面 (局面数, 玩家数)，一次算完。
+    筹码为 0 的玩家视为刚被淘汰，平分排在最后的几个名次的奖金。
+    玩家数不超过 EXACT_MAX_PLAYERS 时用子集动态规划精确计算，
+    否则（或指定了 samples 时）按 ICM 的完赛顺序分布抽样近似。
+    """
+    stacks = np.asarray(stacks, dtype=np.float64)
+    single = stacks.ndim == 1
+    stacks = np.atleast_2d(stacks)
+    if (stacks < 0).any():
+        raise ValueError("筹码不能为负数")
+    num_players = stacks.shape[1]
+    paid = np.zeros(num_players)
+    payouts = np.asarray(payouts, dtype=np.float64)[:num_players]
+    paid[:len(payouts)] = payouts
+
+    if samples is None and num_players <= EXACT_MAX_PLAYERS:
+        values = _icm_exact(stacks, paid)
+    else:
+        values = _icm_monte_carlo(stacks, paid, samples or MC_SAMPLES,
+                                  rng if rng is not None else np.random.default_rng())
+    # Busted players split the places below the live ones evenly
+    busted = stacks == 0
+    num_busted = busted.sum(axis=1, keepdims=True)
+    bottom = paid[::-1].cumsum()[np.maximum(num_busted - 1, 0)]
+    values = np.where(busted, bottom / np.maximum(num_busted, 1), values)
+    return values[0] if single else values
+
+def game_icm(game: PokerGame, payouts: Sequence[float]) -> List[tuple]:
+    """两手牌之间按当前筹码计算每名未出局玩家的 (玩家, 奖金期望)"""
+    players = [p for p in game.players if p.chips > 0]
+    values = icm([p.chips for p in players], payouts)
+    return [(player, float(value)) for player, value in zip(players, values)]
+
+
+# -- push/fold ---------------------------------------------------------------------
+
+def push_fold_ev(stacks: Sequence[int], payouts: Sequence[float], hero: int,
+                 callers: Sequence[int], call_probs, equities,
+                 posted: Optional[Sequence[int]] = None,
+                 walk: Optional[int] = None) -> Tuple[np.ndarray, float]:
+    """前面的人都弃牌时 hero 全下与弃牌的奖金期望 (全下, 弃牌)
+
+    stacks 为这手牌开始前的筹码，posted 为已投入的盲注和前注。
+    callers 是 hero 之后依次行动的玩家，call_probs[..., i] 为 callers[i] 跟注的概率，
+    equities[..., i] 为 hero 对抗其跟注范围的胜率；前导维度（例如 169 种起手牌）一次算完。
+    只考虑第一个跟注者，之后其余玩家都弃牌。hero 弃牌时底池归 walk（默认为最后一名跟注者，即大盲）。
+    """
+    stacks = np.asarray(stacks, dtype=np.float64)
+    posted = np.zeros_like(stacks) if posted is None else np.asarray(posted, dtype=np.float64)
+    call_probs = np.asarray(call_probs, dtype=np.float64)
+    equities = np.asarray(equities, dtype=np.float64)
+    walk = callers[-1] if walk is None else walk
+    pot = posted.sum()
+    behind = stacks - posted
+
+    # Every outcome's final stacks; only their probabilities depend on hero's hand
+    outcomes = [behind.copy(), behind.copy()]
+    outcomes[0][walk] += pot   # hero folds
+    outcomes[1][hero] += pot   # hero pushes, everyone folds
+    for caller in callers:
+        covered = min(stacks[hero], stacks[caller])
+        dead = pot - posted[hero] - posted[caller]
+        for winner, loser in ((hero, caller), (caller, hero)):
+            final = behind.copy()
+            final[winner] = stacks[winner] + covered + dead
+            final[loser] = stacks[loser] - covered
+            outcomes.append(final)
+    values = icm(np.array(outcomes), payouts)[:, hero]
+
+    # Sequential callers: caller i acts only if everyone before folded
+    reach = np.cumprod(np.concatenate([np.ones_like(call_probs[..., :1]),
+                                       1.0 - call_probs[..., :-1]], axis=-1), axis=-1)
+    first_call = reach * call_probs
+    push = (reach[..., -1] * (1.0 - call_probs[..., -1])) * values[1]
+    push = push + (first_call * (equities * values[2::2] + (1.0 - equities) * values[3::2])).sum(axis=-1)
+    return push, float(values[0])
+
+_matrix: Optional[np.ndarray] = None
+
+def _class_matrix() -> np.ndarray:
+    global _matrix
+    if _matrix is None:
+        _matrix = preflop_matrix(seed=0)
+    return _matrix
+
+def push_fold_chart(stacks: Sequence[int], payouts: Sequence[float], hero: int,
+                    callers: Sequence[int], call_ranges: Sequence[CardsLike],
+                    posted: Optional[Sequence[int]] = None, walk: Optional[int] = None,
+                    matrix: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """169 种起手牌全下比弃牌多出的奖金期望，正数表示应当全下
+
+    call_ranges[i] 为 callers[i] 的跟注范围（如 "top 20%"）。跟注概率按 hero 手牌的
+    去牌效应计算，胜率取自 preflop_matrix（未给出 matrix 时首次调用计算一次）。
+    """
+    if matrix is None:
+        matrix = _class_matrix()
+    blocked = (COMBO_BITS[:, None] & COMBO_BITS[None, :]) != 0
+    class_of_hero = np.zeros((len(HAND_CLASSES), len(COMBOS)))
+    for c, combos in enumerate(CLASS_COMBOS):
+        class_of_hero[c, combos] = 1.0 / len(combos)
+
+    call_probs, equities = [], []
+    for call_range in call_ranges:
+        villain = _as_range(call_range)
+        weights = np.zeros(len(COMBOS))
+        weights[villain.combos] = villain.weights
+        # Villain combos still possible with each hero combo, out of the 1225 left
+        open_weight = weights.sum() - blocked @ weights
+        call_probs.append(class_of_hero @ open_weight / 1225)
+        class_weights = np.bincount(COMBO_CLASS, weights=weights, minlength=len(HAND_CLASSES))
+        total = class_weights.sum()
+        equities.append(matrix @ class_weights / total if total else np.full(len(HAND_CLASSES), 0.5))
+
+    push, fold = push_fold_ev(stacks, payouts, hero, callers, np.stack(call_probs, axis=1),
+                              np.stack(equities, axis=1), posted, walk)
+    return {name: float(ev - fold) for name, ev in zip(HAND_CLASSES, push)}
\ No newline at end of file
@@ -0,0 +1,274 @@
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from .cache import atomic_write
+
+# Histogram bucket upper bounds in seconds (1us .. 1s), Prometheus style
+BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+          1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    __slots__ = ('count', 'sum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * (len(BOUNDS) + 1)  # last bucket is +Inf
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.buckets[bisect_left(BOUNDS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """按桶估算分位数（返回所在桶的上界）"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BOUNDS + (float('inf'),), self.buckets):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class Registry:
+    """计数器和延迟直方图"""
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+        self.started = time.time()
+
+    def snapshot(self) -> dict:
+        # Called from the exporter thread while the engine may add new names;
+        # list() copies the items in one step, a comprehension over the live
+        # dict could fail with "dictionary changed size during iteration"
+        histograms = list(self.histograms.items())
+        return {
+            'timestamp': time.time(),
+            'uptime_s': time.time() - self.started,
+            'counters': dict(self.counters),
+            'histograms': {
+                name: {
+                    'count': h.count,
+                    'sum_s': h.sum,
+                    'mean_us': h.sum / h.count * 1e6 if h.count else 0.0,
+                    'p50_us': h.quantile(0.5) * 1e6,
+                    'p99_us': h.quantile(0.99) * 1e6,
+                    'buckets': {('+Inf' if i == len(BOUNDS) else f'{BOUNDS[i]:g}'): n
+                                for i, n in enumerate(h.buckets) if n},
+                } for name, h in histograms
+            },
+        }
+
+    def to_prometheus(self, prefix: str = 'pypoker_') -> str:
+        """Prometheus 文本格式，可交给 node_exporter 的 textfile 收集器"""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'# TYPE {prefix}{name}_total counter')
+            lines.append(f'{prefix}{name}_total {value}')
+        for name, h in sorted(self.histograms.items()):
+            metric = f'{prefix}{name}_seconds'
+            lines.append(f'# TYPE {metric} histogram')
+            cumulative = 0
+            for bound, n in zip(BOUNDS, h.buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum {h.sum}')
+            lines.append(f'{metric}_count {h.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# (owner, attribute, original or None if inherited) for everything enable() replaced
+_patched: List[Tuple[object, str, object]] = []
+
+
+def _timed(name: str, fn: Callable) -> Callable:
+    observe = registry.observe
+    clock = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe(name, clock() - start)
+    return wrapper
+
+def _counted(name: str, fn: Callable) -> Callable:
+    counters = registry.counters
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        counters[name] = counters.get(name, 0) + 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+def instrument(owner, attr: str, name: Optional[str] = None, timed: bool = True):
+    """把 owner.attr 替换为计时（或只计数）的包装，disable() 时还原"""
+    own = vars(owner).get(attr)
+    wrap = _timed if timed else _counted
+    setattr(owner, attr, wrap(name or attr, getattr(owner, attr)))
+    _patched.append((owner, attr, own))
+
+def is_enabled() -> bool:
+    return bool(_patched)
+
+def enable():
+    """开启统计：给引擎热点方法、评估器和随机数生成器装上计时/计数包装
+
+    关闭时原方法被原样还原，因此不开启就没有任何额外开销。
+    界面的 update_display 与 on_game_event 只在 game.poker_gui 已经被导入时才统计，
+    并且要在牌桌注册监听器（开始新游戏）之前开启；
+    process_rng_draws 统计进程内所有 random.Random 实例的抽取次数，不只是牌局的洗牌。
+    """
+    if _patched:
+        return
+    from .evaluator import LookupEvaluator
+    from .poker_game import PokerGame
+    for attr in ('start_new_hand', 'process_action', 'deal_next_street',
+                 'evaluate_hands', 'award_pot'):
+        instrument(PokerGame, attr)
+    instrument(LookupEvaluator, 'evaluate', 'evaluator_calls', timed=False)
+    instrument(LookupEvaluator, 'evaluate_batch', 'evaluator_batch_calls', timed=False)
+    instrument(LookupEvaluator, 'evaluate_keys', 'evaluator_keys_calls', timed=False)
+    # Every draw from a random.Random ends in one of these two methods. The
+    # class is patched, so this counts draws by any code in the process (bots,
+    # the GUI, other libraries), not only the games' shuffles
+    instrument(random.Random, 'getrandbits', 'process_rng_draws', timed=False)
+    instrument(random.Random, 'random', 'process_rng_draws', timed=False)
+    gui = sys.modules.get('game.poker_gui')
+    if gui is not None:
+        # Full repaints happen only on hand_start; every other update goes
+        # through on_game_event
+        instrument(gui.PokerTable, 'update_display')
+        instrument(gui.PokerTable, 'on_game_event')
+
+def disable():
+    while _patched:
+        owner, attr, original = _patched.pop()
+        if original is None:
+            # Inherited (e.g. from the C base of random.Random): drop the override
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+
+
+def write_snapshot(path: str):
+    """按扩展名写出 JSON（默认）或 Prometheus 文本（.prom），先写临时文件再替换"""
+    if path.endswith('.prom'):
+        text = registry.to_prometheus()
+    else:
+        text = json.dumps(registry.snapshot(), indent=2)
+    atomic_write(path, lambda f: f.write(text), 'w')
+
+
+class SnapshotExporter:
+    """后台线程每隔 interval 秒写一次快照，停止时再写最后一次"""
+    def __init__(self, path: str, interval: float = 10.0):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-export', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_snapshot(self.path)
+
+    def start(self) -> 'SnapshotExporter':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        write_snapshot(self.path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class SamplingProfiler:
+    """定时采样一个线程的调用栈，开销与被测代码的调用次数无关
+
+    on_sample 可以接收每次采样到的栈（从最外层到最内层的 "文件:函数" 元组），
+    以便接入外部的性能分析工具；collapsed() 输出可直接生成火焰图的折叠格式。
+    """
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None,
+                 on_sample: Optional[Callable[[Tuple[str, ...]], None]] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.on_sample = on_sample
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            stack = tuple(reversed(stack))
+            self.samples[stack] += 1
+            registry.inc('profiler_samples')
+            if self.on_sample is not None:
+                self.on_sample(stack)
+
+    def start(self) -> 'SamplingProfiler':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def collapsed(self) -> str:
+        return '\n'.join(f"{';'.join(stack)} {n}" for stack, n in self.samples.most_common())
+
+    def top(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """按自身采样数排序的函数"""
+        leaf = Counter()
+        for stack, n in self.samples.items():
+            leaf[stack[-1]] += n
+        return leaf.most_common(limit)
\ No newline at end of file
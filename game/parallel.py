@@ -0,0 +1,58 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import os
+import random
+import time
+from .bots import make_bots
+from .simulator import HandSimulator, SimulationResult
+
+CHUNK_HANDS = 10000
+
+def chunk_seeds(seed: Optional[int], num_chunks: int) -> List[int]:
+    """由一个主种子派生 num_chunks 个互相独立的整数种子，供各分片（或各进程）使用"""
+    import numpy as np
+    children = np.random.SeedSequence(seed).spawn(num_chunks)
+    return [int(child.generate_state(2, np.uint64)[0]) for child in children]
+
+def _run_chunk(args) -> SimulationResult:
+    bot_names, num_hands, seed, small_blind, initial_chips = args
+    rng = random.Random(seed)
+    bots = make_bots(bot_names, random.Random(rng.getrandbits(64)))
+    simulator = HandSimulator(bots, small_blind, initial_chips, rng=rng)
+    return simulator.run(num_hands)
+
+def run_parallel(bot_names: List[str], num_hands: int, seed: Optional[int] = None,
+                 workers: Optional[int] = None, small_blind: int = 10,
+                 initial_chips: int = 1000, chunk_hands: int = CHUNK_HANDS) -> SimulationResult:
+    """把模拟切分成固定大小的分片分发到多个进程
+
+    每个分片的种子只取决于主种子和分片序号，因此结果与进程数量无关，
+    同一个主种子总能得到完全相同的结果。
+    """
+    workers = workers or os.cpu_count() or 1
+    sizes = [chunk_hands] * (num_hands // chunk_hands)
+    if num_hands % chunk_hands:
+        sizes.append(num_hands % chunk_hands)
+    seeds = chunk_seeds(seed, len(sizes))
+    tasks = [(bot_names, size, chunk_seed, small_blind, initial_chips)
+             for size, chunk_seed in zip(sizes, seeds)]
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) <= 1:
+        result = _merge(bot_names, map(_run_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            result = _merge(bot_names, pool.map(_run_chunk, tasks))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def _merge(bot_names: List[str], chunks) -> SimulationResult:
+    result = None
+    for chunk in chunks:
+        if result is None:
+            result = chunk
+        else:
+            result.merge(chunk)
+    if result is None:
+        result = SimulationResult([bot.name for bot in make_bots(bot_names)])
+    return result
\ No newline at end of file
@@ -1,93 +1,298 @@
-from treys import Card, Deck, Evaluator
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+from array import array
+from operator import attrgetter
 import random
+from .cards import FULL_DECK
+from .pots import settle_pots, split_pot
+from .table_state import TableState
+
+# Shared LookupEvaluator, loaded on first use so rules-only callers never load numpy or the tables
+_evaluator = None
 
 class Player:
-    def __init__(self, name: str, chips: int):
+    """玩家视图：数据保存在所属牌桌的 TableState 中
+
+    每次读写都多一层属性调用，引擎内部的热点循环直接读写 TableState 的列。
+    """
+    __slots__ = ('name', '_state', '_idx')
+
+    def __init__(self, name: str, chips: int, state: Optional[TableState] = None, idx: int = 0):
         self.name = name
-        self.chips = chips
-        self.cards = []
-        self.is_folded = False
-        self.current_bet = 0
-        self.is_all_in = False
+        self._state = state if state is not None else TableState(1)
+        self._idx = idx
+        self._state.chips[idx] = chips
+
+    @property
+    def chips(self) -> int:
+        return self._state.chips[self._idx]
+
+    @chips.setter
+    def chips(self, value: int):
+        self._state.chips[self._idx] = value
+
+    @property
+    def current_bet(self) -> int:
+        return self._state.bets[self._idx]
+
+    @current_bet.setter
+    def current_bet(self, value: int):
+        self._state.bets[self._idx] = value
+
+    @property
+    def is_folded(self) -> bool:
+        return bool(self._state.folded[self._idx])
+
+    @is_folded.setter
+    def is_folded(self, value: bool):
+        self._state.folded[self._idx] = value
+
+    @property
+    def is_all_in(self) -> bool:
+        return bool(self._state.all_in[self._idx])
+
+    @is_all_in.setter
+    def is_all_in(self, value: bool):
+        self._state.all_in[self._idx] = value
+
+    @property
+    def cards(self) -> List[int]:
+        hole_cards = self._state.hole_cards
+        i = 2 * self._idx
+        return [card for card in (hole_cards[i], hole_cards[i + 1]) if card]
+
+    @cards.setter
+    def cards(self, cards: List[int]):
+        padded = list(cards) + [0, 0]
+        i = 2 * self._idx
+        self._state.hole_cards[i] = padded[0]
+        self._state.hole_cards[i + 1] = padded[1]
 
     def reset_hand(self):
-        self.cards = []
-        self.is_folded = False
-        self.current_bet = 0
-        self.is_all_in = False
+        self._state.reset_hand(self._idx)
+
+def _state_field(name: str) -> property:
+    # Table-wide scalars live on the TableState; keep them readable as game attributes
+    return property(attrgetter('state.' + name),
+                    lambda self, value: setattr(self.state, name, value))
 
 class PokerGame:
-    def __init__(self, num_players: int, small_blind: int):
+    pot = _state_field('pot')
+    current_bet = _state_field('current_bet')
+    current_player_idx = _state_field('current_player_idx')
+    dealer_idx = _state_field('dealer_idx')
+    players_to_act = _state_field('players_to_act')
+    round_state = _state_field('round_state')  # preflop, flop, turn, river
+
+
+    def __init__(self, num_players: int, small_blind: int, rng: Optional[random.Random] = None):
         self.num_players = num_players
         self.small_blind = small_blind
         self.big_blind = small_blind * 2
+        # Posted by every player with chips before the blinds (tournament levels)
+        self.ante = 0
         self.players: List[Player] = []
-        self.deck = Deck()
-        self.community_cards = []
-        self.pot = 0
-        self.current_player_idx = 0
-        self.dealer_idx = 0
-        self.evaluator = Evaluator()
-        self.current_bet = 0
-        self.round_state = 'preflop'  # preflop, flop, turn, river
+        # All randomness (dealer button, shuffles) comes from this generator,
+        # so seeding it makes a whole run reproducible
+        self.rng = rng if rng is not None else random.Random()
+        # Chips, bets, flags, cards, deck and pot all live in one compact state
+        self.state = TableState(num_players)
+        # Callbacks receiving (event, data) for every state change; see _emit
+        self.listeners: List[Callable[[str, dict], None]] = []
         
+    @property
+    def evaluator(self):
+        global _evaluator
+        if _evaluator is None:
+            from .evaluator import get_evaluator
+            _evaluator = get_evaluator()
+        return _evaluator
+
+    @property
+    def community_cards(self) -> List[int]:
+        return self.state.board.tolist()
+
     def initialize_game(self, player_names: List[str], initial_chips: int):
-        self.players = [Player(name, initial_chips) for name in player_names]
-        self.dealer_idx = random.randint(0, self.num_players - 1)
+        self.state = TableState(len(player_names), initial_chips)
+        self.players = [Player(name, initial_chips, self.state, i)
+                        for i, name in enumerate(player_names)]
+        self.dealer_idx = self.rng.randint(0, self.num_players - 1)
+
+    def add_listener(self, listener: Callable[[str, dict], None]):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, dict], None]):
+        self.listeners.remove(listener)
+
+    def _emit(self, event: str, **data):
+        # Events: deal, ante, blind, hand_start, bet, check, fold, street, turn,
+        # showdown, award.
+        # Callers test self.listeners first so an unobserved game pays nothing.
+        for listener in self.listeners:
+            listener(event, data)
+
+    def copy(self) -> 'PokerGame':
+        """复制牌桌用于搜索或推演，只复制状态数组，规则与评估器共享
+
+        副本的随机数生成器是本牌桌生成器的独立拷贝：从相同状态开始，
+        但各自推进，复制不会改变原牌桌之后发出的牌。
+        """
+        game = PokerGame.__new__(PokerGame)
+        game.__dict__.update(self.__dict__)
+        game.state = self.state.copy()
+        game.listeners = []
+        # Its own generator in the same state; drawing from the parent here
+        # would change the parent's next deals
+        game.rng = random.Random()
+        game.rng.setstate(self.rng.getstate())
+        game.players = [Player(p.name, p.chips, game.state, i) for i, p in enumerate(self.players)]
+        return game
+
+    def snapshot(self) -> TableState:
+        return self.state.copy()
+
+    def restore(self, snapshot: TableState):
+        self.state.restore(snapshot)
         
     def start_new_hand(self):
-        # Reset game state
-        self.deck = Deck()
-        self.community_cards = []
-        self.pot = 0
-        self.current_bet = 0
-        self.round_state = 'preflop'
+        st = self.state
+        # Reset game state (reshuffle a fresh deck list instead of building a Deck)
+        cards = list(FULL_DECK)
+        self.rng.shuffle(cards)
+        st.deck = array('l', cards)
+        del st.board[:]
+        st.pot = 0
+        st.current_bet = 0
+        st.round_state = 'preflop'
         
-        # Reset player hands
-        for player in self.players:
-            player.reset_hand()
+        # Reset player hands; busted players sit the hand out
+        st.reset_hand()
+        for i in range(st.num_players):
+            if st.chips[i] <= 0:
+                st.folded[i] = True
             
-        # Deal cards to players
-        for _ in range(2):
-            for player in self.players:
-                if not player.is_folded:
-                    player.cards.append(self.deck.draw(1)[0])
+        # Deal cards to the players still in the game
+        seated = [i for i in range(st.num_players) if not st.folded[i]]
+        deck = st.deck
+        hole_cards = st.hole_cards
+        for round_idx in range(2):
+            for i in seated:
+                hole_cards[2 * i + round_idx] = deck.pop()
                     
+        # Blinds go to the next seats with chips, chosen before antes can
+        # put anyone all-in
+        sb_pos = self._next_seated_idx(st.dealer_idx)
+        bb_pos = self._next_seated_idx(sb_pos)
+
+        # Antes are dead money: they build the pot but don't count towards calling
+        antes = []
+        if self.ante:
+            for i in range(st.num_players):
+                if not st.folded[i]:
+                    amount = min(self.ante, st.chips[i])
+                    st.chips[i] -= amount
+                    st.contributed[i] += amount
+                    st.pot += amount
+                    if st.chips[i] == 0:
+                        st.all_in[i] = True
+                    antes.append((i, amount))
+
         # Post blinds
-        sb_pos = (self.dealer_idx + 1) % self.num_players
-        bb_pos = (self.dealer_idx + 2) % self.num_players
-        
-        self.players[sb_pos].chips -= self.small_blind
-        self.players[sb_pos].current_bet = self.small_blind
-        self.players[bb_pos].chips -= self.big_blind
-        self.players[bb_pos].current_bet = self.big_blind
-        
-        self.pot = self.small_blind + self.big_blind
-        self.current_bet = self.big_blind
-        self.current_player_idx = (bb_pos + 1) % self.num_players
+        sb = self._put_in(sb_pos, self.small_blind)
+        bb = self._put_in(bb_pos, self.big_blind)
+        st.current_bet = self.big_blind
+        st.current_player_idx = self._next_active_idx(bb_pos)
+        st.players_to_act = self._num_can_act()
+        if self.listeners:
+            self._emit('hand_start', dealer=st.dealer_idx)
+            for i in seated:
+                self._emit('deal', player=i, cards=[hole_cards[2 * i], hole_cards[2 * i + 1]])
+            for i, amount in antes:
+                self._emit('ante', player=i, amount=amount)
+            self._emit('blind', player=sb_pos, amount=sb)
+            self._emit('blind', player=bb_pos, amount=bb)
+
+    def _put_in(self, i: int, amount: int) -> int:
+        # Move chips from a stack into the pot, never more than the stack;
+        # a player who puts in the last chip is all-in
+        st = self.state
+        amount = min(amount, st.chips[i])
+        st.chips[i] -= amount
+        st.bets[i] += amount
+        st.contributed[i] += amount
+        st.pot += amount
+        if st.chips[i] == 0 and not st.folded[i]:
+            st.all_in[i] = True
+        return amount
+
+    def _next_seated_idx(self, idx: int) -> int:
+        # The next player after idx who still has chips
+        chips = self.state.chips
+        for step in range(1, self.num_players + 1):
+            next_idx = (idx + step) % self.num_players
+            if chips[next_idx] > 0:
+                return next_idx
+        return (idx + 1) % self.num_players
+
+    def move_button(self):
+        """把庄家按钮移到下一名还有筹码的玩家"""
+        self.state.dealer_idx = self._next_seated_idx(self.state.dealer_idx)
+
+    def _next_active_idx(self, idx: int) -> int:
+        # Find the next player after idx who can still act
+        st = self.state
+        for step in range(1, self.num_players + 1):
+            next_idx = (idx + step) % self.num_players
+            if not st.folded[next_idx] and not st.all_in[next_idx]:
+                return next_idx
+        return (idx + 1) % self.num_players
+
+    def _num_can_act(self) -> int:
+        st = self.state
+        return sum(1 for i in range(st.num_players) if not st.folded[i] and not st.all_in[i])
+
+    def _reset_street(self):
+        st = self.state
+        for i in range(st.num_players):
+            st.bets[i] = 0
+        st.current_bet = 0
+        st.current_player_idx = self._next_active_idx(st.dealer_idx)
+        # With at most one player able to bet, the board just runs out
+        can_act = self._num_can_act()
+        st.players_to_act = can_act if can_act > 1 else 0
+        if self.listeners:
+            self._emit('street', round_state=st.round_state, board=st.board.tolist())
+            self._emit('turn', player=st.current_player_idx)
 
     def deal_next_street(self):
-        if self.round_state == 'preflop':
+        st = self.state
+        if st.round_state == 'preflop':
             # Deal flop
-            self.community_cards.extend(self.deck.draw(3))
-            self.round_state = 'flop'
-        elif self.round_state == 'flop':
+            for _ in range(3):
+                st.board.append(st.deck.pop())
+            st.round_state = 'flop'
+        elif st.round_state == 'flop':
             # Deal turn
-            self.community_cards.extend(self.deck.draw(1))
-            self.round_state = 'turn'
-        elif self.round_state == 'turn':
+            st.board.append(st.deck.pop())
+            st.round_state = 'turn'
+        elif st.round_state == 'turn':
             # Deal river
-            self.community_cards.extend(self.deck.draw(1))
-            self.round_state = 'river'
+            st.board.append(st.deck.pop())
+            st.round_state = 'river'
+        else:
+            return
+        self._reset_street()
             
     def get_valid_actions(self, player: Player) -> Dict[str, bool]:
-        if player.is_folded or player.is_all_in:
+        st = player._state
+        i = player._idx
+        if st.folded[i] or st.all_in[i]:
             return {'check': False, 'call': False, 'raise': False, 'fold': False}
             
-        can_check = player.current_bet == self.current_bet
-        can_call = player.chips > 0 and player.current_bet < self.current_bet
-        can_raise = player.chips > self.current_bet
+        current_bet = self.state.current_bet
+        chips = st.chips[i]
+        can_check = st.bets[i] == current_bet
+        can_call = chips > 0 and st.bets[i] < current_bet
+        can_raise = chips + st.bets[i] > current_bet
         can_fold = not can_check
         
         return {
@@ -98,45 +303,118 @@ class PokerGame:
         }
         
     def evaluate_hands(self) -> List[tuple]:
+        st = self.state
+        hole_cards = st.hole_cards
+        evaluate = self.evaluator.evaluate
+        board = st.board.tolist()
         results = []
-        for player in self.players:
-            if not player.is_folded:
-                # 将玩家的手牌和公共牌组合在一起
-                all_cards = player.cards + self.community_cards
-                score = self.evaluator.evaluate(all_cards[:5], [])  # 只取前5张牌评估
+        for i, player in enumerate(self.players):
+            if not st.folded[i]:
+                # 用手牌和全部公共牌（共7张）评估牌力
+                score = evaluate([hole_cards[2 * i], hole_cards[2 * i + 1]], board)
                 results.append((player, score))
         return sorted(results, key=lambda x: x[1])
         
     def process_action(self, action: str, amount: Optional[int] = None) -> bool:
-        player = self.players[self.current_player_idx]
-        valid_actions = self.get_valid_actions(player)
-        
-        if not valid_actions.get(action, False):
+        st = self.state
+        i = st.current_player_idx
+        if st.folded[i] or st.all_in[i]:
             return False
-            
+        # Same rules as get_valid_actions, read straight from the state columns
+        bet = st.bets[i]
+        current_bet = st.current_bet
+
         if action == 'fold':
-            player.is_folded = True
+            if bet == current_bet:
+                return False
+            st.folded[i] = True
+            st.players_to_act -= 1
+        elif action == 'check':
+            if bet != current_bet:
+                return False
+            st.players_to_act -= 1
         elif action == 'call':
-            call_amount = self.current_bet - player.current_bet
-            player.chips -= call_amount
-            player.current_bet = self.current_bet
-            self.pot += call_amount
+            if st.chips[i] <= 0 or bet >= current_bet:
+                return False
+            call_amount = current_bet - bet
+            if call_amount < st.chips[i]:
+                st.chips[i] -= call_amount
+                st.bets[i] = st.current_bet
+                st.contributed[i] += call_amount
+                st.pot += call_amount
+            else:
+                # A short stack calls all-in for less
+                self._put_in(i, call_amount)
+            st.players_to_act -= 1
         elif action == 'raise':
-            if amount is None or amount <= self.current_bet:
+            if st.chips[i] + bet <= current_bet or amount is None or amount <= current_bet:
                 return False
-            player.chips -= (amount - player.current_bet)
-            self.pot += (amount - player.current_bet)
-            player.current_bet = amount
-            self.current_bet = amount
+            # Raising more than the stack means raising all-in
+            self._put_in(i, amount - st.bets[i])
+            st.current_bet = st.bets[i]
+            # Everyone else still in the hand has to respond to the raise
+            st.players_to_act = self._num_can_act() - (0 if st.all_in[i] else 1)
+        else:
+            return False
         
         # Move to next player
-        self.current_player_idx = (self.current_player_idx + 1) % self.num_players
+        st.current_player_idx = self._next_active_idx(i)
+        if self.listeners:
+            if action in ('call', 'raise'):
+                self._emit('bet', player=i, action=action, amount=st.bets[i], pot=st.pot)
+            else:
+                self._emit(action, player=i)
+            self._emit('turn', player=st.current_player_idx)
         return True
         
     def is_round_complete(self) -> bool:
-        active_players = [p for p in self.players if not p.is_folded]
-        if len(active_players) == 1:
+        st = self.state
+        if st.folded.count(0) == 1:
             return True
+        if st.players_to_act > 0:
+            return False
             
-        return all(p.current_bet == self.current_bet or p.is_folded or p.is_all_in 
-                  for p in self.players) 
\ No newline at end of file
+        return all(st.bets[i] == st.current_bet or st.folded[i] or st.all_in[i]
+                  for i in range(st.num_players))
+
+    def award_pot(self, scores: Optional[List[Optional[int]]] = None) -> List[tuple]:
+        # Settle the main pot and every side pot; each goes to the best hand
+        # among the players who covered it, split evenly on ties. Callers that
+        # rank the hands elsewhere (e.g. in an executor) pass per-seat scores,
+        # None for folded seats.
+        st = self.state
+        n = st.num_players
+        if scores is None:
+            scores = [None] * n
+            if st.folded.count(0) > 1:
+                results = [(p._idx, score) for p, score in self.evaluate_hands()]
+                for i, score in results:
+                    scores[i] = score
+            else:
+                # Uncontested: the last player standing needs no evaluation
+                scores[st.folded.index(0)] = 0
+                results = None
+        else:
+            results = sorted(((i, score) for i, score in enumerate(scores) if score is not None),
+                             key=lambda r: r[1]) if st.folded.count(0) > 1 else None
+        if results is not None and self.listeners:
+            self._emit('showdown', results=results)
+
+        # Odd chips go to the first winners left of the button
+        first_seat = (st.dealer_idx + 1) % n
+        if 1 in st.all_in:
+            winnings = settle_pots(st.contributed, scores, first_seat)
+        else:
+            # Nobody is all-in, so every live player covered the whole pot
+            winnings = [0] * n
+            split_pot(st.pot, [i for i in range(n) if scores[i] is not None],
+                      scores, winnings, first_seat)
+        payouts = []
+        for i, amount in enumerate(winnings):
+            if amount:
+                st.chips[i] += amount
+                payouts.append((self.players[i], amount))
+        st.pot = 0
+        if self.listeners:
+            self._emit('award', payouts=[(p._idx, amount) for p, amount in payouts])
+        return payouts
\ No newline at end of file
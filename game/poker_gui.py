@@ -100,6 +100,7 @@ class PokerTable(QMainWindow):
         # 初始化游戏相关变量
         self.game: Optional[PokerGame] = None
         self.player_widgets: List[dict] = []
+        self.displayed_player_idx: Optional[int] = None
         
     def start_game(self):
         num_players = self.player_count_spin.value()
@@ -118,6 +119,7 @@ class PokerTable(QMainWindow):
         # 初始化游戏
         self.game = PokerGame(num_players, small_blind)
         self.game.initialize_game(player_names, 1000)  # 初始筹码1000
+        self.game.add_listener(self.on_game_event)
         
         # 禁用设置控件
         self.setup_widget.setEnabled(False)
@@ -197,8 +199,73 @@ class PokerTable(QMainWindow):
             
     def start_new_hand(self):
         if self.game:
+            # hand_start 事件会触发一次完整刷新
             self.game.start_new_hand()
+
+    def on_game_event(self, event: str, data: dict):
+        """根据游戏事件只更新受影响的部件"""
+        if event == 'hand_start':
             self.update_display()
+        elif event == 'bet':
+            self._update_player_chips(data['player'])
+            self.pot_label.setText(f"底池: {data['pot']}")
+            self.current_bet_label.setText(f"当前下注: {self.game.current_bet}")
+        elif event == 'street':
+            board = data['board']
+            for i, label in enumerate(self.community_cards_labels):
+                if i < len(board) and label.pixmap().isNull():
+                    label.setPixmap(self.card_images.get_card_image(board[i]))
+            # 新一轮下注，所有人的下注清零
+            for i in range(len(self.player_widgets)):
+                self._update_player_chips(i)
+            self.current_bet_label.setText(f"当前下注: {self.game.current_bet}")
+        elif event == 'turn':
+            self._set_current_player(data['player'])
+        elif event == 'award':
+            for i, _amount in data['payouts']:
+                self._update_player_chips(i)
+            self.pot_label.setText(f"底池: {self.game.pot}")
+
+    def _update_player_chips(self, i: int):
+        if i >= len(self.player_widgets):
+            return
+        player = self.game.players[i]
+        widget_info = self.player_widgets[i]
+        widget_info['chips_label'].setText(f"筹码: {player.chips}")
+        widget_info['bet_label'].setText(f"下注: {player.current_bet}")
+
+    def _show_cards(self, i: int, face_up: bool):
+        if i >= len(self.player_widgets):
+            return
+        player = self.game.players[i]
+        for j, label in enumerate(self.player_widgets[i]['card_labels']):
+            if face_up and j < len(player.cards):
+                label.setPixmap(self.card_images.get_card_image(player.cards[j]))
+            else:
+                label.setPixmap(self.card_images.get_card_back())
+
+    def _set_current_player(self, i: int):
+        # 只改动上一位和当前玩家的标记与手牌，避免重复计算样式表
+        previous = self.displayed_player_idx
+        if previous != i:
+            if previous is not None and previous < len(self.player_widgets):
+                self.player_widgets[previous]['name_label'].setStyleSheet("")
+                self._show_cards(previous, False)
+            if i < len(self.player_widgets):
+                self.player_widgets[i]['name_label'].setStyleSheet(
+                    "QLabel { color: red; font-weight: bold; }")
+                self._show_cards(i, True)
+            self.displayed_player_idx = i
+        self._update_action_buttons()
+
+    def _update_action_buttons(self):
+        current_player = self.game.players[self.game.current_player_idx]
+        valid_actions = self.game.get_valid_actions(current_player)
+        
+        self.check_button.setEnabled(valid_actions['check'])
+        self.call_button.setEnabled(valid_actions['call'])
+        self.raise_button.setEnabled(valid_actions['raise'])
+        self.fold_button.setEnabled(valid_actions['fold'])
             
     def update_display(self):
         if not self.game:
@@ -237,15 +304,10 @@ class PokerTable(QMainWindow):
                 else:
                     # 其他玩家显示牌背
                     label.setPixmap(self.card_images.get_card_back())
+        self.displayed_player_idx = current_player_idx
                     
         # 更新按钮状态
-        current_player = self.game.players[self.game.current_player_idx]
-        valid_actions = self.game.get_valid_actions(current_player)
-        
-        self.check_button.setEnabled(valid_actions['check'])
-        self.call_button.setEnabled(valid_actions['call'])
-        self.raise_button.setEnabled(valid_actions['raise'])
-        self.fold_button.setEnabled(valid_actions['fold'])
+        self._update_action_buttons()
         
     def player_action(self, action: str):
         if not self.game:
@@ -253,32 +315,35 @@ class PokerTable(QMainWindow):
             
         amount = None
         if action == 'raise':
+            # 加注金额是本轮下注总额，最多全下
+            player = self.game.players[self.game.current_player_idx]
+            all_in = player.chips + player.current_bet
             amount, ok = QInputDialog.getInt(self, "加注", "输入加注金额:",
-                                          self.game.current_bet + self.game.big_blind,
+                                          min(self.game.current_bet + self.game.big_blind, all_in),
                                           self.game.current_bet + 1,
-                                          self.game.players[self.game.current_player_idx].chips)
+                                          all_in)
             if not ok:
                 return
                 
+        # 界面通过游戏事件增量更新，这里不再整体刷新
         if self.game.process_action(action, amount):
-            self.update_display()
-            
-            if self.game.is_round_complete():
-                if self.game.round_state == 'river':
+            # 所有人都已全下时直接发完剩余的公共牌
+            while self.game.is_round_complete():
+                if self.game.round_state == 'river' or self.game.state.folded.count(0) == 1:
                     self.show_winner()
-                else:
-                    self.game.deal_next_street()
-                    self.update_display()
+                    break
+                self.game.deal_next_street()
                     
     def show_winner(self):
         if not self.game:
             return
             
-        results = self.game.evaluate_hands()
-        if results:
-            winner = results[0][0]
+        # 按主池和边池结算，可能有多位赢家
+        payouts = self.game.award_pot()
+        if payouts:
             QMessageBox.information(self, "游戏结束",
-                                 f"{winner.name} 赢得了 {self.game.pot} 筹码!")
+                                 "\n".join(f"{player.name} 赢得了 {amount} 筹码!"
+                                           for player, amount in payouts))
             
         # 开始新的一手牌
         QTimer.singleShot(2000, self.start_new_hand) 
\ No newline at end of file
@@ -0,0 +1,171 @@
+from typing import List, Optional, Sequence, Tuple
+import random
+import numpy as np
+from .bots import Bot
+from .equity import equity_vs_random_batch
+from .evaluator import CARD_TO_INDEX
+from .poker_game import PokerGame
+
+# Action codes used by observations and act_batch, in the order of hand_history.ACTIONS
+ACTIONS = ('check', 'call', 'raise', 'fold')
+CHECK, CALL, RAISE, FOLD = range(4)
+STREETS = {'preflop': 0, 'flop': 1, 'turn': 2, 'river': 3}
+
+Batch = Tuple[np.ndarray, np.ndarray]
+
+
+class Observations:
+    """一批待决策的局面：每个字段是长度为 N 的数组，第 i 行是 games[i] 当前行动玩家看到的局面
+
+    牌为 0..51 下标，未发出的公共牌为 -1；valid[:, CHECK/CALL/RAISE/FOLD]
+    来自 get_valid_actions；min_raise 为最小加注目标（已按筹码封顶）。
+    """
+    def __init__(self, games: Sequence[PokerGame]):
+        self.games = list(games)
+        # Gather plain Python rows first; filling arrays element by element is far slower
+        rows, boards = [], []
+        for game in games:
+            st = game.state
+            i = st.current_player_idx
+            hole_cards = st.hole_cards
+            valid = game.get_valid_actions(game.players[i])
+            rows.append((i, st.num_players, st.folded.count(0), STREETS[st.round_state], st.pot,
+                         st.current_bet, st.bets[i], st.chips[i], game.big_blind,
+                         CARD_TO_INDEX[hole_cards[2 * i]], CARD_TO_INDEX[hole_cards[2 * i + 1]],
+                         valid['check'], valid['call'], valid['raise'], valid['fold']))
+            board = [CARD_TO_INDEX[card] for card in st.board]
+            boards.append(board + [-1] * (5 - len(board)))
+        table = np.array(rows, dtype=np.int64).reshape(len(rows), 15)
+        self.seat = table[:, 0]
+        self.num_players = table[:, 1]
+        self.active = table[:, 2]  # players not folded, including this one
+        self.street = table[:, 3]
+        self.pot = table[:, 4]
+        self.current_bet = table[:, 5]
+        self.bet = table[:, 6]
+        self.chips = table[:, 7]
+        self.big_blind = table[:, 8]
+        self.hole = table[:, 9:11]
+        self.board = np.array(boards, dtype=np.int64).reshape(len(boards), 5)
+        self.valid = table[:, 11:15].astype(bool)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    @property
+    def to_call(self) -> np.ndarray:
+        return np.minimum(self.current_bet - self.bet, self.chips)
+
+    @property
+    def min_raise(self) -> np.ndarray:
+        return np.minimum(self.current_bet + self.big_blind, self.chips + self.bet)
+
+    def passive(self) -> np.ndarray:
+        """每行的被动动作：能让牌就让牌，否则跟注"""
+        return np.where(self.valid[:, CHECK], CHECK, CALL)
+
+
+class Policy:
+    """批量决策策略：act_batch 接收一批局面，返回 (动作编号, 加注目标) 两个数组
+
+    只有 RAISE 行的加注目标会被使用。一次处理整批，
+    向量化或基于模型的策略可以把每次调用的固定开销分摊到所有牌桌。
+    """
+    name = 'policy'
+
+    def act_batch(self, obs: Observations) -> Batch:
+        raise NotImplementedError
+
+
+class CallingStationPolicy(Policy):
+    """永远让牌或跟注"""
+    name = 'call'
+
+    def act_batch(self, obs: Observations) -> Batch:
+        return obs.passive(), np.zeros(len(obs), dtype=np.int64)
+
+
+class RandomPolicy(Policy):
+    """在合法动作中均匀随机选择，加注取最小加注额"""
+    name = 'random'
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def act_batch(self, obs: Observations) -> Batch:
+        # Highest random key among the legal actions
+        keys = np.where(obs.valid, self.rng.random((len(obs), 4)), -1.0)
+        return keys.argmax(axis=1), obs.min_raise
+
+
+class EquityThresholdPolicy(Policy):
+    """按对抗随机手牌的胜率决策：高于 raise_equity 时加注到约一个底池，
+    高于底池赔率时跟注，否则让牌或弃牌。整批局面的胜率一次抽样算完。
+    """
+    name = 'equity'
+
+    def __init__(self, raise_equity: float = 0.6, samples: int = 100,
+                 rng: Optional[np.random.Generator] = None):
+        self.raise_equity = raise_equity
+        self.samples = samples
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def act_batch(self, obs: Observations) -> Batch:
+        equity = equity_vs_random_batch(obs.hole, obs.board, obs.active - 1, self.samples, self.rng)
+        to_call = obs.to_call
+        pot_odds = to_call / np.maximum(obs.pot + to_call, 1)
+        actions = np.where(obs.valid[:, CHECK], CHECK,
+                           np.where(equity >= pot_odds, CALL, FOLD))
+        raising = (equity >= self.raise_equity) & obs.valid[:, RAISE]
+        actions = np.where(raising, RAISE, actions)
+        # Raise to call plus the pot, at least a min-raise, at most all-in
+        target = np.maximum(obs.current_bet + obs.pot + to_call, obs.min_raise)
+        return actions, np.minimum(target, obs.chips + obs.bet)
+
+
+class BotPolicy(Policy):
+    """把逐个决策的 Bot 包装成批量接口，便于和批量策略同场对战"""
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.name = bot.name
+
+    def act_batch(self, obs: Observations) -> Batch:
+        actions = np.empty(len(obs), dtype=np.int64)
+        amounts = np.zeros(len(obs), dtype=np.int64)
+        for row, game in enumerate(obs.games):
+            player = game.players[game.current_player_idx]
+            action, amount = self.bot.act(game, player, game.get_valid_actions(player))
+            actions[row] = ACTIONS.index(action)
+            amounts[row] = amount or 0
+        return actions, amounts
+
+
+POLICIES = {
+    'call': CallingStationPolicy,
+    'random': RandomPolicy,
+    'equity': EquityThresholdPolicy,
+}
+
+def make_policies(names: List[str], rng: Optional[random.Random] = None) -> List[Policy]:
+    """按名称创建策略，需要随机数的策略各自取一个由 rng 派生的生成器"""
+    rng = rng or random.Random()
+    policies = []
+    for name in names:
+        policy_cls = POLICIES[name]
+        if policy_cls is CallingStationPolicy:
+            policies.append(policy_cls())
+        else:
+            policies.append(policy_cls(rng=np.random.default_rng(rng.getrandbits(64))))
+    return policies
+
+def apply_actions(games: Sequence[PokerGame], actions: np.ndarray, amounts: np.ndarray) -> int:
+    """把一批动作交给各自的牌桌，非法动作改为让牌或弃牌，返回被改写的个数"""
+    illegal = 0
+    for game, action, amount in zip(games, actions.tolist(), amounts.tolist()):
+        name = ACTIONS[action]
+        if game.process_action(name, amount if action == RAISE else None):
+            continue
+        illegal += 1
+        player = game.players[game.current_player_idx]
+        game.process_action('check' if game.get_valid_actions(player)['check'] else 'fold')
+    return illegal
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import List, Optional, Sequence, Tuple
+
+def build_side_pots(contributed: Sequence[int], folded: Sequence[bool]) -> List[Tuple[int, List[int]]]:
+    """按投入筹码把底池拆成主池和边池，返回 [(金额, 有资格赢取的座位)]"""
+    n = len(contributed)
+    order = sorted(range(n), key=contributed.__getitem__)
+    pots: List[Tuple[int, List[int]]] = []
+    prev = 0
+    for k, i in enumerate(order):
+        level = contributed[i]
+        if level == prev:
+            continue
+        # Everyone from position k on put in at least this level
+        amount = (level - prev) * (n - k)
+        prev = level
+        eligible = [j for j in order[k:] if not folded[j]]
+        if not eligible and pots:
+            # Dead money above every live player goes to the last contested pot
+            pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+        elif pots and eligible == pots[-1][1]:
+            # A folded player's level does not start a new pot
+            pots[-1] = (pots[-1][0] + amount, eligible)
+        else:
+            pots.append((amount, eligible))
+    return pots
+
+def split_pot(amount: int, eligible: Sequence[int], scores: Sequence[Optional[int]],
+              winnings: List[int], first_seat: int = 0):
+    """把一个底池分给 eligible 中牌力最好的座位，结果累加到 winnings"""
+    best = min(scores[j] for j in eligible)
+    winners = [j for j in eligible if scores[j] == best]
+    share, odd = divmod(amount, len(winners))
+    if odd:
+        n = len(winnings)
+        winners.sort(key=lambda j: (j - first_seat) % n)
+    for w, j in enumerate(winners):
+        winnings[j] += share + (1 if w < odd else 0)
+
+def settle_pots(contributed: Sequence[int], scores: Sequence[Optional[int]],
+                first_seat: int = 0) -> List[int]:
+    """结算所有底池，返回每个座位赢得的筹码
+
+    scores 为每个座位的牌力（越小越好），弃牌的座位为 None。
+    平分时除不尽的筹码从 first_seat（通常是庄家左手边）起按座位顺序逐个分配。
+    """
+    winnings = [0] * len(contributed)
+    for amount, eligible in build_side_pots(contributed, [s is None for s in scores]):
+        if eligible:
+            split_pot(amount, eligible, scores, winnings, first_seat)
+    return winnings
\ No newline at end of file
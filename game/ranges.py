@@ -0,0 +1,346 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import itertools
+import os
+import re
+import numpy as np
+from .cache import CACHE_DIR, atomic_write
+from .evaluator import CARD_KEY, CARD_SUIT_MASK, CARD_TO_INDEX, get_evaluator
+from .parallel import chunk_seeds
+
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'shdc'  # matches the suit order of evaluator card indices
+
+# The 169 starting hand classes: pairs, then suited, then offsuit, high cards first
+HAND_CLASSES: List[str] = (
+    [r + r for r in reversed(RANK_CHARS)]
+    + [RANK_CHARS[h] + RANK_CHARS[l] + 's' for h in range(12, -1, -1) for l in range(h - 1, -1, -1)]
+    + [RANK_CHARS[h] + RANK_CHARS[l] + 'o' for h in range(12, -1, -1) for l in range(h - 1, -1, -1)]
+)
+CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASSES)}
+
+# All 1326 two-card combos as (52-card index, 52-card index), lower index first
+COMBOS = np.array(list(itertools.combinations(range(52), 2)), dtype=np.int64)
+COMBO_INDEX = {(int(a), int(b)): i for i, (a, b) in enumerate(COMBOS)}
+COMBO_BITS = (np.uint64(1) << COMBOS[:, 0].astype(np.uint64)) | \
+    (np.uint64(1) << COMBOS[:, 1].astype(np.uint64))
+COMBO_KEY = CARD_KEY[COMBOS].sum(axis=1)
+COMBO_SUIT_MASK = CARD_SUIT_MASK[COMBOS].sum(axis=1)
+
+def _combo_class(a: int, b: int) -> str:
+    high, low = max(a // 4, b // 4), min(a // 4, b // 4)
+    if high == low:
+        return RANK_CHARS[high] * 2
+    return RANK_CHARS[high] + RANK_CHARS[low] + ('s' if a % 4 == b % 4 else 'o')
+
+COMBO_CLASS = np.array([CLASS_INDEX[_combo_class(a, b)] for a, b in COMBOS.tolist()],
+                       dtype=np.int64)
+CLASS_COMBOS = [np.flatnonzero(COMBO_CLASS == c) for c in range(len(HAND_CLASSES))]
+
+PREFLOP_ORDER_VERSION = 1
+
+CardsLike = Union['HandRange', str, Sequence[int]]
+
+
+class HandRange:
+    """加权的起手牌范围：combos 为 COMBOS 中的下标，weights 为对应权重"""
+    def __init__(self, weights: Optional[Dict[int, float]] = None):
+        weights = {c: w for c, w in (weights or {}).items() if w > 0}
+        self.combos = np.array(sorted(weights), dtype=np.int64)
+        self.weights = np.array([weights[c] for c in self.combos.tolist()], dtype=np.float64)
+
+    @classmethod
+    def parse(cls, text: str) -> 'HandRange':
+        return parse_range(text)
+
+    @classmethod
+    def from_cards(cls, cards: Sequence[int]) -> 'HandRange':
+        """由两张 treys 整数牌（例如 Player.cards）构造只含一个组合的范围"""
+        a, b = sorted(CARD_TO_INDEX[c] for c in cards)
+        return cls({COMBO_INDEX[(a, b)]: 1.0})
+
+    def __len__(self) -> int:
+        return len(self.combos)
+
+    def __repr__(self) -> str:
+        return f"HandRange({len(self)} combos)"
+
+    def cards(self) -> np.ndarray:
+        """每个组合的两张牌下标，形状 (N, 2)"""
+        return COMBOS[self.combos]
+
+    def without(self, dead_cards: Sequence[int]) -> 'HandRange':
+        """去掉与已知牌（0..51 下标）冲突的组合"""
+        dead = np.uint64(0)
+        for card in dead_cards:
+            dead |= np.uint64(1) << np.uint64(card)
+        keep = (COMBO_BITS[self.combos] & dead) == 0
+        pruned = HandRange()
+        pruned.combos = self.combos[keep]
+        pruned.weights = self.weights[keep]
+        return pruned
+
+
+def _expand_token(token: str) -> List[str]:
+    # One range token -> the hand classes it covers
+    m = re.fullmatch(r'([2-9TJQKA])\1(\+)?', token)
+    if m:
+        low = RANK_CHARS.index(token[0])
+        top = 12 if m.group(2) else low
+        return [RANK_CHARS[r] * 2 for r in range(low, top + 1)]
+    m = re.fullmatch(r'([2-9TJQKA])\1-([2-9TJQKA])\2', token)
+    if m:
+        a, b = sorted((RANK_CHARS.index(m.group(1)), RANK_CHARS.index(m.group(2))))
+        return [RANK_CHARS[r] * 2 for r in range(a, b + 1)]
+    m = re.fullmatch(r'([2-9TJQKA])([2-9TJQKA])([so]?)(\+)?', token)
+    if m:
+        high, low = RANK_CHARS.index(m.group(1)), RANK_CHARS.index(m.group(2))
+        if high <= low:
+            raise ValueError(f"无法解析的范围: {token}")
+        kickers = range(low, high) if m.group(4) else (low,)
+        suffixes = m.group(3) or 'so'
+        return [RANK_CHARS[high] + RANK_CHARS[k] + s for k in kickers for s in suffixes]
+    m = re.fullmatch(r'([2-9TJQKA])([2-9TJQKA])([so]?)-([2-9TJQKA])([2-9TJQKA])\3', token)
+    if m:
+        # A5s-A2s walks the kicker; T9s-65s walks both cards with a fixed gap
+        high1, low1, high2, low2 = (RANK_CHARS.index(m.group(g)) for g in (1, 2, 4, 5))
+        if high1 < high2:
+            high1, low1, high2, low2 = high2, low2, high1, low1
+        suffixes = m.group(3) or 'so'
+        if high1 == high2 and max(low1, low2) < high1:
+            hands = [(high1, k) for k in range(min(low1, low2), max(low1, low2) + 1)]
+        elif high1 - low1 == high2 - low2 > 0:
+            hands = [(high2 + k, low2 + k) for k in range(high1 - high2 + 1)]
+        else:
+            raise ValueError(f"无法解析的范围: {token}")
+        return [RANK_CHARS[h] + RANK_CHARS[l] + s for h, l in hands for s in suffixes]
+    raise ValueError(f"无法解析的范围: {token}")
+
+def parse_range(text: str) -> HandRange:
+    """解析常见的范围写法，例如 "22+, A2s+, KQo, T9s-65s:0.5, AsKh, top 15%"
+
+    冒号后是权重（默认 1），后出现的写法覆盖先出现的权重。
+    """
+    weights: Dict[int, float] = {}
+    for raw in text.split(','):
+        token = raw.strip()
+        if not token:
+            continue
+        weight = 1.0
+        if ':' in token:
+            token, weight_text = token.rsplit(':', 1)
+            weight = float(weight_text)
+        token = token.strip()
+
+        m = re.fullmatch(r'(?:top\s*)?(\d+(?:\.\d+)?)%', token, re.IGNORECASE)
+        card = re.fullmatch(r'([2-9TJQKA][shdc])([2-9TJQKA][shdc])', token)
+        if m:
+            combos = np.concatenate([CLASS_COMBOS[CLASS_INDEX[name]]
+                                     for name in top_classes(float(m.group(1)))] or [[]])
+        elif card:
+            a, b = sorted(RANK_CHARS.index(c[0]) * 4 + SUIT_CHARS.index(c[1]) for c in card.groups())
+            if a == b:
+                raise ValueError(f"无法解析的范围: {token}")
+            combos = [COMBO_INDEX[(a, b)]]
+        else:
+            names = _expand_token(token.upper().replace('S', 's').replace('O', 'o'))
+            combos = np.concatenate([CLASS_COMBOS[CLASS_INDEX[name]] for name in names])
+        for combo in np.asarray(combos, dtype=np.int64).tolist():
+            weights[combo] = weight
+    return HandRange(weights)
+
+
+# -- preflop strength ordering (for "top x%") -----------------------------------
+
+_preflop_order: Optional[np.ndarray] = None
+
+def preflop_order() -> np.ndarray:
+    """169 种起手牌按对抗一手随机牌的胜率从强到弱排序后的类别下标"""
+    global _preflop_order
+    if _preflop_order is not None:
+        return _preflop_order
+    path = os.path.join(CACHE_DIR, f'preflop_order_v{PREFLOP_ORDER_VERSION}.npy')
+    try:
+        _preflop_order = np.load(path)
+        return _preflop_order
+    except (OSError, ValueError):
+        pass
+
+    everyone = HandRange({c: 1.0 for c in range(len(COMBOS))})
+    strength = np.array([range_equity(HandRange({int(CLASS_COMBOS[c][0]): 1.0}), everyone,
+                                      samples=20000, seed=c)
+                         for c in range(len(HAND_CLASSES))])
+    _preflop_order = np.argsort(-strength, kind='stable')
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(path, lambda f: np.save(f, _preflop_order))
+    except OSError:
+        pass
+    return _preflop_order
+
+def top_classes(percent: float) -> List[str]:
+    """组合数约占全部 percent% 的最强起手牌类别"""
+    target = len(COMBOS) * percent / 100
+    names = []
+    total = 0
+    for c in preflop_order().tolist():
+        if total >= target:
+            break
+        names.append(HAND_CLASSES[c])
+        total += len(CLASS_COMBOS[c])
+    return names
+
+
+# -- range vs range equity ------------------------------------------------------
+
+def _as_range(cards: CardsLike) -> HandRange:
+    if isinstance(cards, HandRange):
+        return cards
+    if isinstance(cards, str):
+        return parse_range(cards)
+    return HandRange.from_cards(cards)
+
+def _pair_weights(hero: HandRange, villain: HandRange) -> np.ndarray:
+    # Joint weight of every (hero combo, villain combo); pairs sharing a card get 0
+    overlap = (COMBO_BITS[hero.combos][:, None] & COMBO_BITS[villain.combos][None, :]) != 0
+    weights = np.outer(hero.weights, villain.weights)
+    weights[overlap] = 0.0
+    return weights
+
+def _rank_combos(combos: np.ndarray, board_key: int, board_mask: np.ndarray) -> np.ndarray:
+    return get_evaluator().evaluate_keys(COMBO_KEY[combos] + board_key,
+                                         COMBO_SUIT_MASK[combos] | board_mask)
+
+RANGE_CHUNK = 25000
+
+def _range_chunk(args) -> Tuple[float, int]:
+    hero_combos, villain_combos, pair_p, board, samples, seed = args
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(pair_p.size, size=samples, p=pair_p)
+    hero = hero_combos[picks // len(villain_combos)]
+    villain = villain_combos[picks % len(villain_combos)]
+
+    # Runout: random keys per card, with every known card pushed past the cut
+    missing = 5 - len(board)
+    keys = rng.random((samples, 52))
+    keys[:, board] = 2.0
+    rows = np.arange(samples)[:, None]
+    keys[rows, COMBOS[hero]] = 2.0
+    keys[rows, COMBOS[villain]] = 2.0
+    runouts = keys.argpartition(missing - 1, axis=1)[:, :missing]
+
+    board_key = CARD_KEY[board].sum() + CARD_KEY[runouts].sum(axis=1)
+    board_mask = CARD_SUIT_MASK[board].sum(axis=0) + CARD_SUIT_MASK[runouts].sum(axis=1)
+    evaluator = get_evaluator()
+    hero_ranks = evaluator.evaluate_keys(COMBO_KEY[hero] + board_key,
+                                         COMBO_SUIT_MASK[hero] | board_mask)
+    villain_ranks = evaluator.evaluate_keys(COMBO_KEY[villain] + board_key,
+                                            COMBO_SUIT_MASK[villain] | board_mask)
+    share = (hero_ranks < villain_ranks) + 0.5 * (hero_ranks == villain_ranks)
+    return float(share.sum()), samples
+
+def range_equity(hero: CardsLike, villain: CardsLike, board: Sequence[int] = (),
+                 samples: int = 100000, seed: Optional[int] = None,
+                 workers: int = 1) -> float:
+    """hero 对抗 villain 的胜率（平局算一半）
+
+    两方都可以是 HandRange、范围字符串或两张 treys 整数牌（例如 Player.cards）。
+    与公共牌冲突的组合先被剔除，双方共用一张牌的组合对权重为 0。
+    河牌时精确计算，其余情况按组合权重抽样，workers > 1 时分片到多个进程。
+    """
+    board_idx = np.array([CARD_TO_INDEX[c] for c in board], dtype=np.int64)
+    hero = _as_range(hero).without(board_idx)
+    villain = _as_range(villain).without(board_idx)
+    pair_weights = _pair_weights(hero, villain)
+    total = pair_weights.sum()
+    if total == 0:
+        raise ValueError("两个范围没有互不冲突的组合")
+
+    if len(board_idx) == 5:
+        # River: rank each combo once and compare all pairs exactly
+        board_key = int(CARD_KEY[board_idx].sum())
+        board_mask = CARD_SUIT_MASK[board_idx].sum(axis=0)
+        hero_ranks = _rank_combos(hero.combos, board_key, board_mask)
+        villain_ranks = _rank_combos(villain.combos, board_key, board_mask)
+        share = ((hero_ranks[:, None] < villain_ranks[None, :])
+                 + 0.5 * (hero_ranks[:, None] == villain_ranks[None, :]))
+        return float((share * pair_weights).sum() / total)
+
+    # Fixed-size chunks keep results independent of the worker count
+    pair_p = (pair_weights / total).ravel()
+    sizes = [min(RANGE_CHUNK, samples - start) for start in range(0, samples, RANGE_CHUNK)]
+    tasks = [(hero.combos, villain.combos, pair_p, board_idx, size, chunk_seed)
+             for size, chunk_seed in zip(sizes, chunk_seeds(seed, len(sizes)))]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            parts = list(pool.map(_range_chunk, tasks))
+    else:
+        parts = [_range_chunk(task) for task in tasks]
+    return sum(s for s, _ in parts) / sum(n for _, n in parts)
+
+
+# -- 169 x 169 preflop matrix ---------------------------------------------------
+
+BOARD_POOL = 1 << 16
+MATRIX_CHUNKS = 32
+
+def _matrix_rows(args) -> Tuple[List[int], np.ndarray]:
+    rows, samples, seed = args
+    rng = np.random.default_rng(seed)
+    # A pool of random boards with precomputed keys, masks and card bits;
+    # boards that hit either hand are rejected per sample
+    pool = rng.random((BOARD_POOL, 52)).argpartition(4, axis=1)[:, :5]
+    pool_key = CARD_KEY[pool].sum(axis=1)
+    pool_mask = CARD_SUIT_MASK[pool].sum(axis=1)
+    pool_bits = np.bitwise_or.reduce(np.uint64(1) << pool.astype(np.uint64), axis=1)
+    evaluator = get_evaluator()
+    class_sizes = np.array([len(c) for c in CLASS_COMBOS])
+    class_start = np.concatenate([[0], np.cumsum(class_sizes)[:-1]])
+    flat_combos = np.concatenate(CLASS_COMBOS)
+
+    result = np.zeros((len(rows), len(HAND_CLASSES)))
+    for r, i in enumerate(rows):
+        opponents = np.repeat(np.arange(i, len(HAND_CLASSES)), samples)
+        hero = CLASS_COMBOS[i][rng.integers(0, len(CLASS_COMBOS[i]), len(opponents))]
+        villain = flat_combos[class_start[opponents]
+                              + (rng.random(len(opponents)) * class_sizes[opponents]).astype(np.int64)]
+        boards = rng.integers(0, BOARD_POOL, len(opponents))
+        hero_bits, villain_bits = COMBO_BITS[hero], COMBO_BITS[villain]
+        valid = ((hero_bits & villain_bits) == 0) & (((hero_bits | villain_bits) & pool_bits[boards]) == 0)
+
+        hero, villain, boards, opponents = hero[valid], villain[valid], boards[valid], opponents[valid]
+        hero_ranks = evaluator.evaluate_keys(COMBO_KEY[hero] + pool_key[boards],
+                                             COMBO_SUIT_MASK[hero] | pool_mask[boards])
+        villain_ranks = evaluator.evaluate_keys(COMBO_KEY[villain] + pool_key[boards],
+                                                COMBO_SUIT_MASK[villain] | pool_mask[boards])
+        share = (hero_ranks < villain_ranks) + 0.5 * (hero_ranks == villain_ranks)
+        totals = np.bincount(opponents, weights=share, minlength=len(HAND_CLASSES))
+        counts = np.bincount(opponents, minlength=len(HAND_CLASSES))
+        result[r] = np.divide(totals, counts, out=np.full(len(HAND_CLASSES), np.nan),
+                              where=counts > 0)
+    return rows, result
+
+def preflop_matrix(samples: int = 2000, seed: Optional[int] = None,
+                   workers: Optional[int] = None) -> np.ndarray:
+    """169×169 的起手牌胜率矩阵，[i, j] 为 HAND_CLASSES[i] 对抗 HAND_CLASSES[j] 的胜率
+
+    每格约 samples 次抽样（与对手共用牌的样本被剔除），只计算上三角再镜像。
+    同一种子的结果与进程数无关。
+    """
+    workers = workers or os.cpu_count() or 1
+    # Interleave rows so every chunk gets a similar share of the triangle
+    chunks = [list(range(c, len(HAND_CLASSES), MATRIX_CHUNKS)) for c in range(MATRIX_CHUNKS)]
+    tasks = [(rows, samples, chunk_seed)
+             for rows, chunk_seed in zip(chunks, chunk_seeds(seed, MATRIX_CHUNKS))]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_matrix_rows, tasks))
+    else:
+        parts = [_matrix_rows(task) for task in tasks]
+
+    matrix = np.full((len(HAND_CLASSES), len(HAND_CLASSES)), np.nan)
+    for rows, values in parts:
+        matrix[rows] = values
+    upper = np.triu_indices(len(HAND_CLASSES), k=1)
+    matrix[upper[1], upper[0]] = 1.0 - matrix[upper]
+    return matrix
\ No newline at end of file
@@ -0,0 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+import os
+import numpy as np
+from .equity import _runout_ranks, _win_tie
+from .evaluator import CARD_TO_INDEX, get_evaluator
+from .parallel import chunk_seeds
+from .poker_game import PokerGame
+
+MAX_PLAYERS = 10
+ROLLOUT_CHUNKS = 16
+
+# Layout of the shared int64 state buffer; cards are 0..51 indices
+NUM_PLAYERS, BOARD_LEN = 0, 1
+HOLE = 2                        # 2 * MAX_PLAYERS hole cards
+LIVE = HOLE + 2 * MAX_PLAYERS   # MAX_PLAYERS flags: still contesting the pot
+BOARD = LIVE + MAX_PLAYERS      # 5 board cards
+STATE_SIZE = BOARD + 5
+
+# Per-worker views of the shared buffers, set up once by _attach
+_state: Optional[np.ndarray] = None
+_results: Optional[np.ndarray] = None
+_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _attach(state_name: str, results_name: str):
+    global _state, _results
+    for name in (state_name, results_name):
+        # Workers share the parent's resource tracker, which unlinks the blocks once
+        _blocks.append(shared_memory.SharedMemory(name=name))
+    _state = np.ndarray((STATE_SIZE,), dtype=np.int64, buffer=_blocks[0].buf)
+    _state.flags.writeable = False
+    _results = np.ndarray((ROLLOUT_CHUNKS, MAX_PLAYERS, 2), dtype=np.float64,
+                          buffer=_blocks[1].buf)
+    # Map the lookup tables before the first task arrives
+    get_evaluator()
+
+
+def _rollout_chunk(args):
+    chunk, samples, seed = args
+    state = _state
+    num_players = int(state[NUM_PLAYERS])
+    live = np.flatnonzero(state[LIVE:LIVE + num_players])
+    hole = state[HOLE:HOLE + 2 * num_players].reshape(num_players, 2)[live]
+    board = state[BOARD:BOARD + state[BOARD_LEN]]
+    # Same card pool as monte_carlo_equity: folded hands go back into the runouts
+    remaining = np.setdiff1d(np.arange(52), np.concatenate([hole.ravel(), board]))
+
+    ranks = _runout_ranks(hole, board, remaining, samples, np.random.default_rng(seed))
+    win, tie = _win_tie(ranks)
+    out = _results[chunk]
+    out[:] = 0.0
+    out[live, 0] = win * samples
+    out[live, 1] = tie * samples
+
+
+class RolloutPool:
+    """多进程蒙特卡洛推演：牌局状态和结果都放在共享内存里，任务本身只传分片号和种子
+
+    工作进程在启动时映射一次共享内存和评估器查找表（查找表本身就是内存映射文件，
+    各进程共享同一份页缓存），之后每次推演都不再序列化玩家、底牌或公共牌。
+    """
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._state_block = shared_memory.SharedMemory(create=True, size=STATE_SIZE * 8)
+        self._results_block = shared_memory.SharedMemory(
+            create=True, size=ROLLOUT_CHUNKS * MAX_PLAYERS * 2 * 8)
+        self.state = np.ndarray((STATE_SIZE,), dtype=np.int64, buffer=self._state_block.buf)
+        self.results = np.ndarray((ROLLOUT_CHUNKS, MAX_PLAYERS, 2), dtype=np.float64,
+                                  buffer=self._results_block.buf)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_attach,
+            initargs=(self._state_block.name, self._results_block.name))
+
+    def load(self, game: PokerGame):
+        """把牌局写入共享状态：底牌、仍在争夺底池的玩家和公共牌"""
+        st = game.state
+        if st.num_players > MAX_PLAYERS:
+            raise ValueError(f"最多支持 {MAX_PLAYERS} 名玩家")
+        state = self.state
+        state[NUM_PLAYERS] = st.num_players
+        for i in range(st.num_players):
+            dealt = st.hole_cards[2 * i] and st.hole_cards[2 * i + 1]
+            state[LIVE + i] = bool(dealt) and not st.folded[i]
+            state[HOLE + 2 * i] = CARD_TO_INDEX.get(st.hole_cards[2 * i], 0)
+            state[HOLE + 2 * i + 1] = CARD_TO_INDEX.get(st.hole_cards[2 * i + 1], 0)
+        state[BOARD_LEN] = len(st.board)
+        state[BOARD:BOARD + len(st.board)] = [CARD_TO_INDEX[c] for c in st.board]
+
+    def equity(self, game: PokerGame, samples: int = 10000,
+               seed: Optional[int] = None) -> List[tuple]:
+        """与 game_equity 相同，返回每名未弃牌玩家的 (玩家, 获胜概率, 平分概率)
+
+        样本固定分成 ROLLOUT_CHUNKS 片，同一种子的结果与进程数无关。
+        """
+        self.load(game)
+        live = np.flatnonzero(self.state[LIVE:LIVE + game.state.num_players])
+        if not len(live):
+            return []
+        sizes = [samples // ROLLOUT_CHUNKS + (1 if c < samples % ROLLOUT_CHUNKS else 0)
+                 for c in range(ROLLOUT_CHUNKS)]
+        tasks = [(chunk, size, chunk_seed)
+                 for chunk, (size, chunk_seed) in enumerate(zip(sizes, chunk_seeds(seed, ROLLOUT_CHUNKS)))
+                 if size]
+        # Workers write their rows in place; the map only signals completion
+        for _ in self._pool.map(_rollout_chunk, tasks):
+            pass
+        totals = self.results[[chunk for chunk, _, _ in tasks]].sum(axis=0) / samples
+        return [(game.players[i], float(totals[i, 0]), float(totals[i, 1])) for i in live.tolist()]
+
+    def close(self):
+        self._pool.shutdown()
+        # Views into the blocks must go before the blocks can be closed
+        del self.state, self.results
+        for block in (self._state_block, self._results_block):
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,410 @@
+from concurrent.futures import Executor
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+import asyncio
+import random
+import struct
+from .bots import CallingStationBot
+from .poker_game import PokerGame
+
+# Frames are a 3-byte header (payload length u16, message type u8) plus payload.
+HEADER = struct.Struct('<HB')
+
+# Server -> client
+MSG_STATE = 1    # table, hand, street, to_act, pot, current_bet, board[5], seats, per seat
+MSG_HOLE = 2     # table, seat, card, card
+MSG_TURN = 3     # table, seat, valid action mask, timeout (ms), turn id
+MSG_RESULT = 4   # table, hand, winners, per winner (seat, amount)
+MSG_ERROR = 5    # code
+# Client -> server
+MSG_JOIN = 10    # table, seat
+MSG_ACTION = 11  # table, action, amount, turn id from MSG_TURN
+MSG_LEAVE = 12   # table
+
+ERR_BAD_TABLE = 1
+ERR_SEAT_TAKEN = 2
+ERR_NOT_SEATED = 3
+ERR_BAD_MESSAGE = 4
+
+TIMEOUT = -1  # pseudo seat for turn timeout markers in a table's action queue
+# Clients whose unsent output passes this many bytes are too slow to keep up and are dropped
+MAX_WRITE_BUFFER = 1 << 20
+
+ACTIONS = ['check', 'call', 'raise', 'fold']
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+STREETS = ['preflop', 'flop', 'turn', 'river']
+STREET_CODES = {name: code for code, name in enumerate(STREETS)}
+
+STATE_HEAD = struct.Struct('<IIBBii5iB')
+STATE_SEAT = struct.Struct('<iiB')
+HOLE = struct.Struct('<IBii')
+TURN = struct.Struct('<IBBII')
+RESULT_HEAD = struct.Struct('<IIB')
+RESULT_SEAT = struct.Struct('<Bi')
+ERROR = struct.Struct('<B')
+JOIN = struct.Struct('<IB')
+ACTION = struct.Struct('<IBiI')
+LEAVE = struct.Struct('<I')
+
+
+def _rank_hands(hands: List[Tuple[int, int]], board: List[int]) -> List[int]:
+    # Runs in the executor on plain ints, so it works with process pools too
+    from .evaluator import get_evaluator
+    evaluator = get_evaluator()
+    return [evaluator.evaluate(list(hand), board) for hand in hands]
+
+
+def frame(msg_type: int, payload: bytes) -> bytes:
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+def decode_message(msg_type: int, payload: bytes) -> Tuple[str, dict]:
+    """把服务器发出的消息解码为 (消息名, 字段)"""
+    if msg_type == MSG_STATE:
+        table, hand, street, to_act, pot, current_bet, *rest = STATE_HEAD.unpack_from(payload)
+        board, seats = rest[:5], rest[5]
+        players = [STATE_SEAT.unpack_from(payload, STATE_HEAD.size + i * STATE_SEAT.size)
+                   for i in range(seats)]
+        return 'state', {
+            'table': table, 'hand': hand, 'round_state': STREETS[street], 'to_act': to_act,
+            'pot': pot, 'current_bet': current_bet, 'board': [c for c in board if c],
+            'chips': [p[0] for p in players], 'bets': [p[1] for p in players],
+            'folded': [bool(p[2] & 1) for p in players],
+            'all_in': [bool(p[2] & 2) for p in players],
+        }
+    if msg_type == MSG_HOLE:
+        table, seat, first, second = HOLE.unpack(payload)
+        return 'hole', {'table': table, 'seat': seat, 'cards': [first, second]}
+    if msg_type == MSG_TURN:
+        table, seat, mask, timeout_ms, turn = TURN.unpack(payload)
+        return 'turn', {'table': table, 'seat': seat, 'timeout_ms': timeout_ms, 'turn': turn,
+                        'valid_actions': {a: bool(mask & (1 << i)) for i, a in enumerate(ACTIONS)}}
+    if msg_type == MSG_RESULT:
+        table, hand, winners = RESULT_HEAD.unpack_from(payload)
+        payouts = [RESULT_SEAT.unpack_from(payload, RESULT_HEAD.size + i * RESULT_SEAT.size)
+                   for i in range(winners)]
+        return 'result', {'table': table, 'hand': hand, 'payouts': payouts}
+    if msg_type == MSG_ERROR:
+        return 'error', {'code': ERROR.unpack(payload)[0]}
+    raise ValueError(f"未知消息类型: {msg_type}")
+
+
+class Table:
+    def __init__(self, table_id: int, seats: int, small_blind: int, initial_chips: int,
+                 rng: random.Random):
+        self.table_id = table_id
+        self.game = PokerGame(seats, small_blind, rng)
+        self.game.initialize_game([f"seat-{i+1}" for i in range(seats)], initial_chips)
+        self.initial_chips = initial_chips
+        self.hand_no = 0
+        # (seat, action, amount, turn id) submitted by clients, or
+        # (TIMEOUT, None, None, turn id); entries for any other turn are dropped
+        self.actions: asyncio.Queue = asyncio.Queue()
+        self.turn_id = 0
+        self.owners: List[Optional['Connection']] = [None] * seats
+        self.bots = [CallingStationBot(f"bot-{i+1}") for i in range(seats)]
+        self.occupied = asyncio.Event()
+
+    def encode_state(self) -> bytes:
+        st = self.game.state
+        board = (st.board.tolist() + [0] * 5)[:5]
+        parts = [STATE_HEAD.pack(self.table_id, self.hand_no, STREET_CODES[st.round_state],
+                                 st.current_player_idx, st.pot, st.current_bet, *board,
+                                 st.num_players)]
+        for i in range(st.num_players):
+            parts.append(STATE_SEAT.pack(st.chips[i], st.bets[i],
+                                         st.folded[i] | (st.all_in[i] << 1)))
+        return frame(MSG_STATE, b''.join(parts))
+
+
+class Connection:
+    def __init__(self, server: 'TableServer', writer: asyncio.StreamWriter):
+        self.server = server
+        self.writer = writer
+        self.out: List[bytes] = []
+        self.seats: Dict[int, int] = {}  # table id -> seat
+        self.task = asyncio.current_task()  # the _handle_client reading from this client
+
+    def send(self, data: bytes):
+        if self.writer.is_closing():
+            return
+        self.out.append(data)
+        self.server._schedule_flush(self)
+
+
+class TableServer:
+    """基于 asyncio 的多牌桌服务器
+
+    每张牌桌由一个协程推进，玩家动作经由该桌的队列送达并受回合超时限制；
+    状态广播在每次事件循环迭代末尾合并发送，摊牌评估交给执行器处理。
+    没有客户端入座的牌桌不会开局，空座位由服务器端机器人代打。
+    """
+    def __init__(self, num_tables: int, seats: int = 6, small_blind: int = 10,
+                 initial_chips: int = 1000, turn_timeout: float = 10.0,
+                 seed: Optional[int] = None, executor: Optional[Executor] = None):
+        rng = random.Random(seed)
+        self.tables = [Table(i, seats, small_blind, initial_chips, random.Random(rng.getrandbits(64)))
+                       for i in range(num_tables)]
+        self.turn_timeout = turn_timeout
+        self.executor = executor
+        self._dirty_tables: Set[Table] = set()
+        self._dirty_connections: Set[Connection] = set()
+        self._connections: Set[Connection] = set()
+        self._flush_scheduled = False
+        self._tasks: List[asyncio.Task] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start_unix(self, path: str):
+        self._server = await asyncio.start_unix_server(self._handle_client, path)
+        self._start_tables()
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0):
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._start_tables()
+
+    def _start_tables(self):
+        self._tasks = [asyncio.create_task(self._run_table(table)) for table in self.tables]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            # wait_closed() also waits for open connections (Python 3.12.1+);
+            # a client that is not reading would never let close() finish
+            for conn in self._connections:
+                if conn.writer.transport.get_write_buffer_size():
+                    conn.writer.transport.abort()
+                else:
+                    conn.writer.close()
+            await asyncio.gather(*(conn.task for conn in self._connections),
+                                 return_exceptions=True)
+            await self._server.wait_closed()
+
+    # -- broadcasting -------------------------------------------------------
+
+    def _schedule_flush(self, conn: Optional[Connection] = None):
+        if conn is not None:
+            self._dirty_connections.add(conn)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _mark_dirty(self, table: Table):
+        self._dirty_tables.add(table)
+        self._schedule_flush()
+
+    def _flush(self):
+        # One state frame per changed table, one write per connection
+        self._flush_scheduled = False
+        for table in self._dirty_tables:
+            owners = [conn for conn in table.owners if conn is not None]
+            if owners:
+                state = table.encode_state()
+                for conn in set(owners):
+                    conn.out.append(state)
+                    self._dirty_connections.add(conn)
+        self._dirty_tables.clear()
+        for conn in self._dirty_connections:
+            writer = conn.writer
+            if writer.is_closing():
+                conn.out.clear()
+            elif conn.out:
+                writer.write(b''.join(conn.out))
+                conn.out.clear()
+                # No drain() here: a stalled client is cut off instead of
+                # growing the server's buffer without bound
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    writer.transport.abort()
+        self._dirty_connections.clear()
+
+    # -- table loop ---------------------------------------------------------
+
+    async def _run_table(self, table: Table):
+        game = table.game
+        loop = asyncio.get_running_loop()
+        while True:
+            await table.occupied.wait()
+            for player in game.players:
+                if player.chips < game.big_blind:
+                    player.chips = table.initial_chips
+            game.start_new_hand()
+            table.hand_no += 1
+            for seat, conn in enumerate(table.owners):
+                if conn is not None:
+                    cards = game.players[seat].cards
+                    conn.send(frame(MSG_HOLE, HOLE.pack(table.table_id, seat, cards[0], cards[1])))
+            self._mark_dirty(table)
+
+            while game.state.folded.count(0) > 1:
+                if game.is_round_complete():
+                    if game.round_state == 'river':
+                        break
+                    game.deal_next_street()
+                    self._mark_dirty(table)
+                    continue
+                seat = game.current_player_idx
+                action, amount = await self._next_action(table, seat)
+                if not game.process_action(action, amount):
+                    valid_actions = game.get_valid_actions(game.players[seat])
+                    if not game.process_action('check' if valid_actions['check'] else 'fold'):
+                        break
+                self._mark_dirty(table)
+
+            # Only the hand ranking runs off the event loop; the chips are
+            # settled here so the table state is never touched elsewhere
+            st = game.state
+            if st.folded.count(0) > 1:
+                live = [i for i in range(st.num_players) if not st.folded[i]]
+                hands = [(st.hole_cards[2 * i], st.hole_cards[2 * i + 1]) for i in live]
+                ranks = await loop.run_in_executor(self.executor, _rank_hands,
+                                                   hands, st.board.tolist())
+                scores: List[Optional[int]] = [None] * st.num_players
+                for i, rank in zip(live, ranks):
+                    scores[i] = rank
+                payouts = game.award_pot(scores)
+            else:
+                payouts = game.award_pot()
+            result = frame(MSG_RESULT, RESULT_HEAD.pack(table.table_id, table.hand_no, len(payouts))
+                           + b''.join(RESULT_SEAT.pack(p._idx, amount) for p, amount in payouts))
+            for conn in set(c for c in table.owners if c is not None):
+                conn.send(result)
+            self._mark_dirty(table)
+            game.dealer_idx = (game.dealer_idx + 1) % game.num_players
+            await asyncio.sleep(0)
+
+    async def _next_action(self, table: Table, seat: int) -> Tuple[str, Optional[int]]:
+        game = table.game
+        player = game.players[seat]
+        valid_actions = game.get_valid_actions(player)
+        conn = table.owners[seat]
+        if conn is None:
+            return table.bots[seat].act(game, player, valid_actions)
+
+        # Clients echo the turn id, so early or duplicate actions never answer a later turn
+        table.turn_id += 1
+        turn_id = table.turn_id
+        mask = sum(1 << i for i, a in enumerate(ACTIONS) if valid_actions[a])
+        conn.send(frame(MSG_TURN, TURN.pack(table.table_id, seat, mask,
+                                            int(self.turn_timeout * 1000), turn_id)))
+        # The timeout arrives through the queue as a marker for this turn,
+        # so waiting stays a plain queue.get() that cancels cleanly
+        timer = asyncio.get_running_loop().call_later(
+            self.turn_timeout, table.actions.put_nowait, (TIMEOUT, None, None, turn_id))
+        try:
+            while True:
+                acting_seat, action, amount, action_turn = await table.actions.get()
+                if table.owners[seat] is not conn:
+                    break
+                if action_turn != turn_id:
+                    continue
+                if acting_seat == seat:
+                    return action, amount
+                if acting_seat == TIMEOUT:
+                    break
+        finally:
+            timer.cancel()
+        # Timed out or left the table: take the passive option
+        return ('check', None) if valid_actions['check'] else ('fold', None)
+
+    # -- client protocol ----------------------------------------------------
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(self, writer)
+        self._connections.add(conn)
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                length, msg_type = HEADER.unpack(header)
+                payload = await reader.readexactly(length)
+                try:
+                    self._dispatch(conn, msg_type, payload)
+                except (struct.error, IndexError, ValueError):
+                    conn.send(frame(MSG_ERROR, ERROR.pack(ERR_BAD_MESSAGE)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(conn)
+            for table_id in list(conn.seats):
+                self._leave(conn, table_id)
+            writer.close()
+
+    def _dispatch(self, conn: Connection, msg_type: int, payload: bytes):
+        if msg_type == MSG_ACTION:
+            table_id, code, amount, turn_id = ACTION.unpack(payload)
+            seat = conn.seats.get(table_id)
+            if seat is None:
+                conn.send(frame(MSG_ERROR, ERROR.pack(ERR_NOT_SEATED)))
+                return
+            table = self.tables[table_id]
+            # Stale turn ids (late, early or repeated actions) are dropped here
+            if turn_id == table.turn_id:
+                table.actions.put_nowait((seat, ACTIONS[code], amount, turn_id))
+        elif msg_type == MSG_JOIN:
+            table_id, seat = JOIN.unpack(payload)
+            if not 0 <= table_id < len(self.tables) or table_id in conn.seats:
+                conn.send(frame(MSG_ERROR, ERROR.pack(ERR_BAD_TABLE)))
+                return
+            table = self.tables[table_id]
+            if seat >= len(table.owners) or table.owners[seat] is not None:
+                conn.send(frame(MSG_ERROR, ERROR.pack(ERR_SEAT_TAKEN)))
+                return
+            table.owners[seat] = conn
+            conn.seats[table_id] = seat
+            table.occupied.set()
+            self._mark_dirty(table)
+        elif msg_type == MSG_LEAVE:
+            (table_id,) = LEAVE.unpack(payload)
+            self._leave(conn, table_id)
+        else:
+            raise ValueError(msg_type)
+
+    def _leave(self, conn: Connection, table_id: int):
+        seat = conn.seats.pop(table_id, None)
+        if seat is None:
+            return
+        table = self.tables[table_id]
+        table.owners[seat] = None
+        # Wake the table in case it is waiting on this seat
+        table.actions.put_nowait((TIMEOUT, None, None, table.turn_id))
+        if all(owner is None for owner in table.owners):
+            table.occupied.clear()
+
+
+class TableClient:
+    """连接 TableServer 的精简客户端，供机器人或轻量界面使用"""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> 'TableClient':
+        return cls(*await asyncio.open_unix_connection(path))
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> 'TableClient':
+        return cls(*await asyncio.open_connection(host, port))
+
+    def join(self, table: int, seat: int):
+        self.writer.write(frame(MSG_JOIN, JOIN.pack(table, seat)))
+
+    def leave(self, table: int):
+        self.writer.write(frame(MSG_LEAVE, LEAVE.pack(table)))
+
+    def act(self, table: int, turn: int, action: str, amount: Optional[int] = None):
+        """turn 为对应 MSG_TURN 消息中的回合编号"""
+        self.writer.write(frame(MSG_ACTION, ACTION.pack(table, ACTION_CODES[action], amount or 0,
+                                                        turn)))
+
+    async def messages(self) -> AsyncIterator[Tuple[str, dict]]:
+        while True:
+            try:
+                header = await self.reader.readexactly(HEADER.size)
+            except asyncio.IncompleteReadError:
+                return
+            length, msg_type = HEADER.unpack(header)
+            yield decode_message(msg_type, await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
\ No newline at end of file
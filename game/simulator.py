@@ -0,0 +1,99 @@
+from typing import List, Optional
+from array import array
+import random
+import time
+from .poker_game import PokerGame
+from .bots import Bot
+
+class SimulationResult:
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.hands = 0
+        self.showdowns = 0
+        self.elapsed = 0.0
+        self.chip_deltas = [0] * len(names)
+        self.wins = [0] * len(names)
+
+    def merge(self, other: 'SimulationResult'):
+        self.hands += other.hands
+        self.showdowns += other.showdowns
+        for i in range(len(self.names)):
+            self.chip_deltas[i] += other.chip_deltas[i]
+            self.wins[i] += other.wins[i]
+
+    @property
+    def hands_per_sec(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else 0.0
+
+class HandSimulator:
+    """无界面批量模拟：复用同一个 PokerGame 连续打完整手牌"""
+    def __init__(self, bots: List[Bot], small_blind: int = 10, initial_chips: int = 1000,
+                 reset_stacks: bool = True, rng: Optional[random.Random] = None):
+        self.bots = bots
+        self.initial_chips = initial_chips
+        self.reset_stacks = reset_stacks
+        self.game = PokerGame(len(bots), small_blind, rng)
+        self.game.initialize_game([bot.name for bot in bots], initial_chips)
+
+    def play_hand(self) -> List[tuple]:
+        game = self.game
+        players = game.players
+        bots = self.bots
+        # Read the state columns directly; the player views and game
+        # properties cost an extra call per access in this loop
+        st = game.state
+
+        if self.reset_stacks:
+            st.chips[:] = array('q', [self.initial_chips]) * st.num_players
+        game.start_new_hand()
+
+        while True:
+            if st.folded.count(0) == 1:
+                break
+            if game.is_round_complete():
+                if st.round_state == 'river':
+                    break
+                game.deal_next_street()
+                continue
+
+            idx = st.current_player_idx
+            player = players[idx]
+            valid_actions = game.get_valid_actions(player)
+            action, amount = bots[idx].act(game, player, valid_actions)
+            if not game.process_action(action, amount):
+                # Illegal bot decisions fall back to the passive option
+                fallback = 'check' if valid_actions['check'] else 'fold'
+                if not game.process_action(fallback):
+                    break
+
+        payouts = game.award_pot()
+        game.move_button()
+        return payouts
+
+    def run(self, num_hands: int, result: Optional[SimulationResult] = None) -> SimulationResult:
+        game = self.game
+        players = game.players
+        if result is None:
+            result = SimulationResult([p.name for p in players])
+        index = {id(p): i for i, p in enumerate(players)}
+
+        start = time.perf_counter()
+        for _ in range(num_hands):
+            st = game.state
+            if self.reset_stacks:
+                before = [self.initial_chips] * len(players)
+            else:
+                before = st.chips.tolist()
+            payouts = self.play_hand()
+
+            if st.folded.count(0) > 1:
+                result.showdowns += 1
+            for player, _amount in payouts:
+                result.wins[index[id(player)]] += 1
+            chips = st.chips
+            deltas = result.chip_deltas
+            for i in range(len(players)):
+                deltas[i] += chips[i] - before[i]
+        result.elapsed += time.perf_counter() - start
+        result.hands += num_hands
+        return result
\ No newline at end of file
@@ -0,0 +1,76 @@
+from array import array
+from typing import Optional
+
+class TableState:
+    """一张牌桌的全部可变状态，按列存放在紧凑的 array 中
+
+    每名玩家占每一列的一个位置（底牌列占两个位置，0 表示没有牌），
+    因此复制整张牌桌只需要复制几段连续内存。
+    """
+    __slots__ = ('num_players', 'chips', 'bets', 'contributed', 'folded', 'all_in', 'hole_cards',
+                 'board', 'deck', 'pot', 'current_bet', 'current_player_idx',
+                 'dealer_idx', 'players_to_act', 'round_state')
+
+    def __init__(self, num_players: int, chips: int = 0):
+        self.num_players = num_players
+        self.chips = array('q', [chips]) * num_players
+        self.bets = array('q', [0]) * num_players
+        self.contributed = array('q', [0]) * num_players  # chips put in this hand
+        self.folded = array('b', [0]) * num_players
+        self.all_in = array('b', [0]) * num_players
+        self.hole_cards = array('l', [0]) * (2 * num_players)
+        self.board = array('l')
+        self.deck = array('l')
+        self.pot = 0
+        self.current_bet = 0
+        self.current_player_idx = 0
+        self.dealer_idx = 0
+        self.players_to_act = 0
+        self.round_state = 'preflop'
+
+    def copy(self) -> 'TableState':
+        state = TableState.__new__(TableState)
+        state.num_players = self.num_players
+        state.chips = self.chips[:]
+        state.bets = self.bets[:]
+        state.contributed = self.contributed[:]
+        state.folded = self.folded[:]
+        state.all_in = self.all_in[:]
+        state.hole_cards = self.hole_cards[:]
+        state.board = self.board[:]
+        state.deck = self.deck[:]
+        state.pot = self.pot
+        state.current_bet = self.current_bet
+        state.current_player_idx = self.current_player_idx
+        state.dealer_idx = self.dealer_idx
+        state.players_to_act = self.players_to_act
+        state.round_state = self.round_state
+        return state
+
+    def restore(self, snapshot: 'TableState'):
+        """原地恢复到快照，已有的玩家视图仍然有效"""
+        self.chips[:] = snapshot.chips
+        self.bets[:] = snapshot.bets
+        self.contributed[:] = snapshot.contributed
+        self.folded[:] = snapshot.folded
+        self.all_in[:] = snapshot.all_in
+        self.hole_cards[:] = snapshot.hole_cards
+        self.board[:] = snapshot.board
+        self.deck[:] = snapshot.deck
+        self.pot = snapshot.pot
+        self.current_bet = snapshot.current_bet
+        self.current_player_idx = snapshot.current_player_idx
+        self.dealer_idx = snapshot.dealer_idx
+        self.players_to_act = snapshot.players_to_act
+        self.round_state = snapshot.round_state
+
+    def reset_hand(self, idx: Optional[int] = None):
+        # Clear per-hand columns for one seat, or for the whole table
+        seats = range(self.num_players) if idx is None else (idx,)
+        for i in seats:
+            self.bets[i] = 0
+            self.contributed[i] = 0
+            self.folded[i] = 0
+            self.all_in[i] = 0
+            self.hole_cards[2 * i] = 0
+            self.hole_cards[2 * i + 1] = 0
\ No newline at end of file
@@ -0,0 +1,266 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+import os
+import random
+import time
+from .bots import RandomBot, make_bots
+from .simulator import HandSimulator
+
+# (small blind, ante) per level; the big blind is always twice the small blind
+DEFAULT_LEVELS = (
+    (10, 0), (15, 0), (25, 0), (50, 5), (75, 10), (100, 15), (150, 20), (200, 25),
+    (300, 40), (400, 50), (600, 75), (800, 100), (1000, 150), (1500, 200), (2000, 300),
+    (3000, 400), (4000, 500), (6000, 800), (8000, 1000), (10000, 1500),
+)
+
+
+class BlindSchedule:
+    """盲注结构：每 hands_per_level 手升一级，超过最后一级后盲注和前注每级翻倍"""
+    def __init__(self, levels: Sequence[Tuple[int, int]] = DEFAULT_LEVELS,
+                 hands_per_level: int = 10):
+        if not levels:
+            raise ValueError("盲注结构至少需要一级")
+        if hands_per_level < 1:
+            raise ValueError("每级手数必须为正数")
+        self.levels = tuple((int(small_blind), int(ante)) for small_blind, ante in levels)
+        self.hands_per_level = hands_per_level
+
+    @classmethod
+    def parse(cls, text: str, hands_per_level: int = 10) -> 'BlindSchedule':
+        """解析 "10/0,15/0,25/5" 形式的 小盲注/前注 列表，前注可省略"""
+        levels = []
+        for token in text.split(','):
+            small_blind, _, ante = token.strip().partition('/')
+            try:
+                levels.append((int(small_blind), int(ante or 0)))
+            except ValueError:
+                raise ValueError(f"无法解析盲注级别: {token!r}") from None
+        return cls(levels, hands_per_level)
+
+    def level(self, hand: int) -> int:
+        return hand // self.hands_per_level
+
+    def blinds(self, hand: int) -> Tuple[int, int]:
+        """比赛第 hand 手（从 0 起计）的 (小盲注, 前注)"""
+        level = self.level(hand)
+        last = len(self.levels) - 1
+        small_blind, ante = self.levels[min(level, last)]
+        if level > last:
+            scale = 2 ** (level - last)
+            small_blind, ante = small_blind * scale, ante * scale
+        return small_blind, ante
+
+
+# This process's simulator for each table id, with the seats it was built for.
+# Reused from round to round until someone at the table busts.
+_simulators: Dict[int, Tuple[List[int], HandSimulator]] = {}
+# The live table ids sent with the round's tasks the cache was last pruned for
+_live_tables: Optional[FrozenSet[int]] = None
+
+def _table_simulator(table_id: int, seats: List[int], strategies: List[str],
+                     seed: int, live: FrozenSet[int]) -> HandSimulator:
+    # Every generator is reseeded here, so a reused simulator deals and acts
+    # exactly like a new one and results never depend on which process
+    # played the table last round
+    global _live_tables
+    if live is not _live_tables:
+        # First task of a new round (or chunk) here: forget broken tables.
+        # Workers never see the director's state, so this is where they learn it
+        for dead in [t for t in _simulators if t not in live]:
+            del _simulators[dead]
+        _live_tables = live
+    cached = _simulators.get(table_id)
+    if cached is not None and cached[0] == seats:
+        simulator = cached[1]
+    else:
+        rng = random.Random(seed)
+        simulator = HandSimulator(make_bots(strategies, rng), reset_stacks=False, rng=rng)
+        _simulators[table_id] = (seats, simulator)
+    rng = simulator.game.rng
+    rng.seed(seed)
+    for bot in simulator.bots:
+        if isinstance(bot, RandomBot):
+            bot.rng.seed(rng.getrandbits(64))
+    return simulator
+
+def _play_table(args):
+    # Play one table for up to num_hands hands. Busted players leave the table
+    # and the rest play on until only one of them is left.
+    table_id, live, seats, stacks, strategies, button, first_hand, num_hands, schedule, seed = args
+    busts = []  # (hand offset, entrant, stack before that hand)
+    played = 0
+    while played < num_hands and len(seats) > 1:
+        simulator = _table_simulator(table_id, seats, strategies, seed, live)
+        game = simulator.game
+        chips = game.state.chips
+        for i, stack in enumerate(stacks):
+            chips[i] = stack
+        game.dealer_idx = button
+        while played < num_hands:
+            small_blind, ante = schedule.blinds(first_hand + played)
+            game.small_blind, game.big_blind, game.ante = small_blind, 2 * small_blind, ante
+            before = chips.tolist()
+            simulator.play_hand()
+            played += 1
+            if 0 in chips:
+                break
+
+        survivors = [i for i in range(len(seats)) if chips[i]]
+        busts.extend((played, seats[i], before[i]) for i in range(len(seats)) if not chips[i])
+        # The button moves on to the next player still seated
+        button = game.dealer_idx
+        while not chips[button]:
+            button = (button + 1) % len(seats)
+        button = survivors.index(button)
+        seats = [seats[i] for i in survivors]
+        stacks = [chips[i] for i in survivors]
+        strategies = [strategies[i] for i in survivors]
+        seed = game.rng.getrandbits(64)
+    return seats, stacks, button, played, busts
+
+
+class TournamentResult:
+    def __init__(self, strategies: List[str]):
+        self.strategies = strategies
+        self.places: List[int] = []  # entrant ids, champion first
+        self.hands = 0               # hands played, summed over all tables
+        self.rounds = 0
+        self.level = 0
+        self.elapsed = 0.0
+
+    @property
+    def hands_per_sec(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def prizes(self, payouts: Sequence[float]) -> List[float]:
+        """按名次奖金表（第一名在前）得出每名参赛者的奖金"""
+        prizes = [0.0] * len(self.strategies)
+        for entrant, prize in zip(self.places, payouts):
+            prizes[entrant] = prize
+        return prizes
+
+
+class Tournament:
+    """多桌锦标赛：盲注升级、淘汰、拆桌与平衡，全部由机器人参赛时可无界面快进
+
+    所有牌桌同步推进，每轮各打 balance_every 手后统一处理淘汰、拆桌和平衡。
+    一轮之内各牌桌互不影响，可以分发到多个进程；每桌每轮的种子按固定顺序
+    取自主种子，因此结果与进程数量无关。
+    """
+    def __init__(self, strategies: Sequence[str], starting_chips: int = 1000,
+                 schedule: Optional[BlindSchedule] = None, seats_per_table: int = 9,
+                 balance_every: int = 1, seed: Optional[int] = None):
+        if len(strategies) < 2:
+            raise ValueError("至少需要2名参赛者")
+        if not 2 <= seats_per_table <= 10:
+            raise ValueError("每桌人数必须在2到10之间")
+        self.strategies = list(strategies)
+        self.schedule = schedule or BlindSchedule()
+        self.seats_per_table = seats_per_table
+        self.balance_every = balance_every
+        self.rng = random.Random(seed)
+        self.chips = [starting_chips] * len(self.strategies)
+        self.hand = 0  # tournament clock: hands played by every table so far
+        self.result = TournamentResult(self.strategies)
+        self._busted: List[int] = []  # worst finish first
+
+        # Random seat draw, dealt round-robin so table sizes differ by at most one
+        entrants = list(range(len(self.strategies)))
+        self.rng.shuffle(entrants)
+        num_tables = -(-len(entrants) // seats_per_table)
+        self.tables: List[List[int]] = [entrants[t::num_tables] for t in range(num_tables)]
+        # Stable ids, so each table keeps its simulator while others are broken
+        self.table_ids = list(range(num_tables))
+        self.buttons = [self.rng.randrange(len(seats)) for seats in self.tables]
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(seats) for seats in self.tables)
+
+    def play_round(self, pool: Optional[ProcessPoolExecutor] = None, workers: int = 1):
+        """所有牌桌各打一轮，然后处理淘汰并重新平衡牌桌；workers 为 pool 的进程数"""
+        # One shared set per round; pickle sends it once per chunk
+        live = frozenset(self.table_ids)
+        tasks = [(table_id, live, seats, [self.chips[e] for e in seats],
+                  [self.strategies[e] for e in seats], button, self.hand, self.balance_every,
+                  self.schedule, self.rng.getrandbits(64))
+                 for table_id, seats, button in zip(self.table_ids, self.tables, self.buttons)]
+        if pool is None or len(tasks) < 2:
+            outcomes = map(_play_table, tasks)
+        else:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            outcomes = pool.map(_play_table, tasks, chunksize=chunksize)
+
+        busts = []
+        for t, (seats, stacks, button, played, table_busts) in enumerate(outcomes):
+            self.tables[t] = seats
+            self.buttons[t] = button
+            for entrant, stack in zip(seats, stacks):
+                self.chips[entrant] = stack
+            self.result.hands += played
+            busts.extend(table_busts)
+        # Later busts finish higher; on the same hand the bigger starting stack does
+        for _hand, entrant, _stack in sorted(busts, key=lambda b: (b[0], b[2], -b[1])):
+            self.chips[entrant] = 0
+            self._busted.append(entrant)
+        self.hand += self.balance_every
+        self.result.rounds += 1
+        self._balance()
+
+    def _remove(self, t: int, seat: int) -> int:
+        seats = self.tables[t]
+        entrant = seats.pop(seat)
+        if seat < self.buttons[t]:
+            self.buttons[t] -= 1
+        if seats:
+            self.buttons[t] %= len(seats)
+        return entrant
+
+    def _seat(self, t: int, entrant: int):
+        # New arrivals sit just before the button, so they post no blind before
+        # the button has passed them
+        self.tables[t].insert(self.buttons[t], entrant)
+        self.buttons[t] += 1
+
+    def _smallest(self, exclude: int = -1) -> int:
+        return min((t for t in range(len(self.tables)) if t != exclude),
+                   key=lambda t: len(self.tables[t]))
+
+    def _balance(self):
+        # Break the shortest tables while the field fits on fewer of them
+        needed = -(-self.remaining // self.seats_per_table)
+        while len(self.tables) > needed:
+            broken = self._smallest()
+            movers = self.tables.pop(broken)
+            self.buttons.pop(broken)
+            self.table_ids.pop(broken)
+            for entrant in movers:
+                self._seat(self._smallest(), entrant)
+        # Then move the next big blind from the longest table to the shortest
+        # until table sizes differ by at most one
+        while True:
+            longest = max(range(len(self.tables)), key=lambda t: len(self.tables[t]))
+            shortest = self._smallest(longest) if len(self.tables) > 1 else longest
+            if len(self.tables[longest]) - len(self.tables[shortest]) <= 1:
+                break
+            size = len(self.tables[longest])
+            self._seat(shortest, self._remove(longest, (self.buttons[longest] + 2) % size))
+
+    def run(self, workers: Optional[int] = 1) -> TournamentResult:
+        """一直打到只剩一名玩家，workers 为 None 时使用全部 CPU"""
+        workers = workers or os.cpu_count() or 1
+        start = time.perf_counter()
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while self.remaining > 1:
+                self.play_round(pool, workers)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            # Worker caches go away with the pool; drop this process's too
+            _simulators.clear()
+        result = self.result
+        result.places = [seats[0] for seats in self.tables if seats] + self._busted[::-1]
+        result.level = self.schedule.level(self.hand)
+        result.elapsed += time.perf_counter() - start
+        return result
\ No newline at end of file
@@ -1,8 +1,9 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from game.poker_gui import PokerTable
 
 def main():
+    # Qt is imported only when the GUI actually starts
+    from PyQt6.QtWidgets import QApplication
+    from game.poker_gui import PokerTable
     app = QApplication(sys.argv)
     window = PokerTable()
     window.show()
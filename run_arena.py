@@ -0,0 +1,35 @@
+import argparse
+import random
+from game.arena import Arena
+from game.policies import POLICIES, make_policies
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas 批量策略对战")
+    parser.add_argument('-n', '--hands', type=int, default=10000, help="总手数")
+    parser.add_argument('-p', '--policies', nargs='+', default=['random', 'call', 'equity'],
+                        choices=sorted(POLICIES), help="参战策略，轮流坐遍各个座位")
+    parser.add_argument('-t', '--tables', type=int, default=256, help="同时进行的牌桌数")
+    parser.add_argument('--seats', type=int, default=6, help="每桌人数")
+    parser.add_argument('--small-blind', type=int, default=10, help="小盲注")
+    parser.add_argument('--chips', type=int, default=1000, help="初始筹码")
+    parser.add_argument('--seed', type=int, default=None, help="主随机种子，相同种子结果完全一致")
+    args = parser.parse_args()
+
+    if args.tables < 1:
+        parser.error("牌桌数必须为正数")
+    rng = random.Random(args.seed)
+    try:
+        arena = Arena(make_policies(args.policies, rng), args.tables, args.seats,
+                      args.small_blind, args.chips, rng.getrandbits(64))
+    except ValueError as e:
+        parser.error(str(e))
+    result = arena.run(args.hands)
+
+    print(f"手数: {result.hands}  摊牌: {result.showdowns}  决策: {result.decisions}  "
+          f"批次: {result.batches}  非法动作: {result.illegal}  用时: {result.elapsed:.2f}s  "
+          f"速度: {result.hands_per_sec:.0f} 手/秒, {result.decisions_per_sec:.0f} 决策/秒")
+    for i, name in enumerate(result.names):
+        print(f"{name:>10}  筹码变化: {result.chip_deltas[i]:+d}  {result.bb_per_100(i):+.1f} bb/100")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,49 @@
+import argparse
+from game.bots import BOTS
+from game.tournament import DEFAULT_LEVELS, BlindSchedule, Tournament
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas 多桌锦标赛快进模拟")
+    parser.add_argument('-n', '--entrants', type=int, default=1000, help="参赛人数")
+    parser.add_argument('-b', '--bots', nargs='+', default=['random', 'call', 'raise'],
+                        choices=sorted(BOTS), help="参赛者策略，按顺序循环分配")
+    parser.add_argument('--chips', type=int, default=1000, help="起始筹码")
+    parser.add_argument('--levels', default=','.join(f'{sb}/{ante}' for sb, ante in DEFAULT_LEVELS),
+                        help="盲注结构，逗号分隔的 小盲注/前注")
+    parser.add_argument('--hands-per-level', type=int, default=10, help="每级盲注打多少手")
+    parser.add_argument('--seats', type=int, default=9, help="每桌人数")
+    parser.add_argument('--balance-every', type=int, default=1, help="每打多少手平衡一次牌桌")
+    parser.add_argument('--payouts', help="奖金表，逗号分隔，第一名在前")
+    parser.add_argument('--seed', type=int, default=None, help="主随机种子，相同种子结果完全一致")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="并行进程数（0表示使用全部CPU）")
+    args = parser.parse_args()
+
+    try:
+        schedule = BlindSchedule.parse(args.levels, args.hands_per_level)
+        payouts = [float(x) for x in args.payouts.split(',')] if args.payouts else []
+        strategies = [args.bots[i % len(args.bots)] for i in range(args.entrants)]
+        tournament = Tournament(strategies, args.chips, schedule, args.seats,
+                                args.balance_every, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = tournament.run(args.workers or None)
+    small_blind, ante = schedule.blinds(tournament.hand)
+    print(f"参赛: {args.entrants}  手数: {result.hands}  轮数: {result.rounds}  "
+          f"结束级别: {result.level + 1} ({small_blind}/{2 * small_blind} 前注 {ante})  "
+          f"用时: {result.elapsed:.2f}s  速度: {result.hands_per_sec:.0f} 手/秒")
+
+    champion = result.places[0]
+    print(f"冠军: #{champion} ({strategies[champion]})")
+    place_of = {entrant: place for place, entrant in enumerate(result.places, 1)}
+    prizes = result.prizes(payouts)
+    for name in sorted(set(strategies)):
+        entrants = [e for e, s in enumerate(strategies) if s == name]
+        average = sum(place_of[e] for e in entrants) / len(entrants)
+        line = f"{name:>8}  人数: {len(entrants)}  平均名次: {average:.1f}"
+        if payouts:
+            line += f"  奖金: {sum(prizes[e] for e in entrants):g}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
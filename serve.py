@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+from game.server import TableServer
+
+async def run(args):
+    server = TableServer(args.tables, args.seats, args.small_blind, args.chips,
+                         args.turn_timeout, args.seed)
+    if args.socket:
+        await server.start_unix(args.socket)
+        print(f"{args.tables} 张牌桌已启动，监听 {args.socket}")
+    else:
+        await server.start_tcp(args.host, args.port)
+        print(f"{args.tables} 张牌桌已启动，监听 {args.host}:{args.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas 多牌桌服务器")
+    parser.add_argument('--tables', type=int, default=1000, help="牌桌数量")
+    parser.add_argument('--seats', type=int, default=6, help="每桌座位数")
+    parser.add_argument('--small-blind', type=int, default=10, help="小盲注")
+    parser.add_argument('--chips', type=int, default=1000, help="初始筹码")
+    parser.add_argument('--turn-timeout', type=float, default=10.0, help="每次行动的超时秒数")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--socket', help="Unix 套接字路径（不指定则使用 TCP）")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9999)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import argparse
+from game import metrics
+from game.bots import BOTS
+from game.parallel import run_parallel
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas 无界面批量模拟")
+    parser.add_argument('-n', '--hands', type=int, default=10000, help="模拟的手数")
+    parser.add_argument('-b', '--bots', nargs='+', default=['random'] * 6,
+                        choices=sorted(BOTS), help="每个座位的机器人策略")
+    parser.add_argument('--small-blind', type=int, default=10, help="小盲注")
+    parser.add_argument('--chips', type=int, default=1000, help="初始筹码")
+    parser.add_argument('--seed', type=int, default=None, help="主随机种子，相同种子结果完全一致")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="并行进程数（0表示使用全部CPU）")
+    parser.add_argument('--metrics', help="写出统计快照的文件（.json 或 .prom）")
+    parser.add_argument('--metrics-interval', type=float, default=10.0, help="快照写出间隔（秒）")
+    parser.add_argument('--profile', help="写出采样分析结果（火焰图折叠格式）的文件")
+    args = parser.parse_args()
+
+    if not 2 <= len(args.bots) <= 10:
+        parser.error("玩家数量必须在2到10之间")
+    if (args.metrics or args.profile) and args.workers != 1:
+        parser.error("--metrics 和 --profile 只统计当前进程，请使用 --workers 1")
+
+    exporter = profiler = None
+    if args.metrics:
+        metrics.enable()
+        exporter = metrics.SnapshotExporter(args.metrics, args.metrics_interval).start()
+    if args.profile:
+        profiler = metrics.SamplingProfiler().start()
+    try:
+        result = run_parallel(args.bots, args.hands, args.seed, args.workers or None,
+                              args.small_blind, args.chips)
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        if profiler is not None:
+            profiler.stop()
+            with open(args.profile, 'w') as f:
+                f.write(profiler.collapsed())
+
+    print(f"手数: {result.hands}  摊牌: {result.showdowns}  "
+          f"用时: {result.elapsed:.2f}s  速度: {result.hands_per_sec:.0f} 手/秒")
+    for name, delta, wins in zip(result.names, result.chip_deltas, result.wins):
+        print(f"{name:>12}  筹码变化: {delta:+d}  赢得底池: {wins}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
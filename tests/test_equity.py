@@ -0,0 +1,42 @@
+import numpy as np
+from treys import Card, Deck, Evaluator
+from game.equity import get_evaluator, monte_carlo_equity
+from game.evaluator import to_indices
+
+def cards(*texts):
+    return [Card.new(t) for t in texts]
+
+def test_evaluate_batch_matches_treys():
+    evaluator = Evaluator()
+    deck = Deck.GetFullDeck()
+    rng = np.random.default_rng(0)
+    hands = [[deck[i] for i in rng.choice(52, 7, replace=False)] for _ in range(2000)]
+    ranks = get_evaluator().evaluate_batch(np.array([to_indices(h) for h in hands]))
+    assert ranks.tolist() == [evaluator.evaluate(h[:2], h[2:]) for h in hands]
+
+def test_river_equity_is_the_showdown_result():
+    board = cards('2c', '7d', '9h', 'Js', 'Qc')
+    win, tie = monte_carlo_equity([cards('As', 'Ad'), cards('Kh', 'Kd'), cards('Qs', 'Qd')], board)
+    assert win.tolist() == [0.0, 0.0, 1.0]
+    assert tie.tolist() == [0.0, 0.0, 0.0]
+
+def test_split_pot_counts_as_tie():
+    board = cards('Ac', 'Kd', 'Qh', 'Js', 'Tc')
+    win, tie = monte_carlo_equity([cards('2s', '3d'), cards('4h', '5d')], board)
+    assert win.tolist() == [0.0, 0.0]
+    assert tie.tolist() == [1.0, 1.0]
+
+def test_preflop_aces_vs_kings():
+    # Enumerating all 1,712,304 boards gives 81.06% / 18.55% with 0.38% split
+    win, tie = monte_carlo_equity([cards('As', 'Ah'), cards('Kd', 'Kc')], samples=40000,
+                                  rng=np.random.default_rng(1))
+    assert abs(win[0] - 0.8106) < 0.01
+    assert abs(win[1] - 0.1855) < 0.01
+    assert tie[0] == tie[1] and abs(tie[0] - 0.0038) < 0.003
+
+def test_same_seed_same_result():
+    hands = [cards('Ah', 'Kh'), cards('7c', '7d'), cards('Js', 'Ts')]
+    board = cards('2h', '7h', 'Ks')
+    first = monte_carlo_equity(hands, board, 5000, np.random.default_rng(42))
+    second = monte_carlo_equity(hands, board, 5000, np.random.default_rng(42))
+    assert np.array_equal(first[0], second[0]) and np.array_equal(first[1], second[1])
\ No newline at end of file
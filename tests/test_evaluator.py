@@ -0,0 +1,36 @@
+import random
+import numpy as np
+from treys import Deck, Evaluator
+from game.evaluator import LookupEvaluator
+from game.poker_game import PokerGame
+
+def random_hands(count, size, seed):
+    deck = Deck.GetFullDeck()
+    rng = random.Random(seed)
+    return [rng.sample(deck, size) for _ in range(count)]
+
+def test_evaluate_matches_treys(tmp_path):
+    lookup = LookupEvaluator(str(tmp_path))
+    evaluator = Evaluator()
+    for size in (5, 6, 7):
+        for cards in random_hands(1000, size, size):
+            assert lookup.evaluate(cards[:2], cards[2:]) == evaluator.evaluate(cards[:2], cards[2:])
+
+def test_tables_reload_from_disk(tmp_path):
+    built = LookupEvaluator(str(tmp_path))
+    loaded = LookupEvaluator(str(tmp_path))
+    assert isinstance(loaded.nonflush_table, np.memmap)
+    assert np.array_equal(built.nonflush_table, loaded.nonflush_table)
+    assert np.array_equal(built.flush_table, loaded.flush_table)
+
+def test_evaluate_hands_ranks_all_seven_cards():
+    evaluator = Evaluator()
+    for _ in range(50):
+        game = PokerGame(6, 10)
+        game.initialize_game([f'p{i}' for i in range(6)], 1000)
+        game.start_new_hand()
+        for _ in range(3):
+            game.deal_next_street()
+        results = game.evaluate_hands()
+        assert [score for _, score in results] == sorted(
+            evaluator.evaluate(player.cards, game.community_cards) for player in game.players)
\ No newline at end of file
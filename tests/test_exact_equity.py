@@ -0,0 +1,45 @@
+import itertools
+import numpy as np
+import pytest
+from treys import Card, Deck, Evaluator
+from game.equity import exact_equity, monte_carlo_equity
+
+def cards(*texts):
+    return [Card.new(t) for t in texts]
+
+def brute_force_equity(hands, board):
+    # Rank every runout with treys and count outright wins and split pots
+    evaluator = Evaluator()
+    used = set(board).union(*hands)
+    remaining = [c for c in Deck.GetFullDeck() if c not in used]
+    win = np.zeros(len(hands))
+    tie = np.zeros(len(hands))
+    runouts = list(itertools.combinations(remaining, 5 - len(board)))
+    for runout in runouts:
+        scores = [evaluator.evaluate(hand, board + list(runout)) for hand in hands]
+        best = [s == min(scores) for s in scores]
+        (win if sum(best) == 1 else tie)[best] += 1
+    return win / len(runouts), tie / len(runouts)
+
+@pytest.mark.parametrize('hands, board', [
+    ([cards('Ah', 'Kh'), cards('7c', '7d')], cards('2h', '7h', 'Ks', '9c')),
+    ([cards('As', 'Qs'), cards('Jd', 'Jc'), cards('5h', '6h')], cards('4h', '7s', 'Jh', '2s')),
+    ([cards('Ah', 'Kh'), cards('7c', '7d'), cards('Js', 'Ts')], cards('2h', '7h', 'Ks')),
+    ([cards('2c', '3d'), cards('2d', '3c')], cards('Ah', 'Kh', 'Qh', 'Jh', '9s')),
+])
+def test_exact_matches_brute_force(hands, board):
+    win, tie = exact_equity(hands, board)
+    expected_win, expected_tie = brute_force_equity(hands, board)
+    assert np.allclose(win, expected_win) and np.allclose(tie, expected_tie)
+
+def test_exact_agrees_with_monte_carlo():
+    hands = [cards('Ah', 'Kh'), cards('7c', '7d'), cards('Js', 'Ts'), cards('9d', '8d')]
+    board = cards('2h', '7h', 'Ks')
+    win, tie = exact_equity(hands, board)
+    mc_win, mc_tie = monte_carlo_equity(hands, board, 50000, np.random.default_rng(7))
+    assert np.abs(win - mc_win).max() < 0.01
+    assert np.abs(tie - mc_tie).max() < 0.01
+
+def test_exact_rejects_preflop():
+    with pytest.raises(ValueError):
+        exact_equity([cards('Ah', 'Kh'), cards('7c', '7d')], [])
\ No newline at end of file
@@ -0,0 +1,48 @@
+import random
+from game.bots import RandomBot
+from game.hand_history import HandHistoryReader, HandHistoryWriter
+from game.poker_game import PokerGame
+
+def normalize(value):
+    # The reader rebuilds sequences as lists of tuples; compare contents only
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+def play_hands(game, hands, rng):
+    bot = RandomBot('bot', rng)
+    for _ in range(hands):
+        for player in game.players:
+            player.chips = 1000
+        game.start_new_hand()
+        while sum(not p.is_folded for p in game.players) > 1:
+            if game.is_round_complete():
+                if game.round_state == 'river':
+                    break
+                game.deal_next_street()
+                continue
+            player = game.players[game.current_player_idx]
+            action, amount = bot.act(game, player, game.get_valid_actions(player))
+            game.process_action(action, amount)
+        game.award_pot()
+
+def test_replay_matches_live_events(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    game = PokerGame(4, 10, random.Random(3))
+    game.initialize_game(['a', 'b', 'c', 'd'], 1000)
+    live = []
+    game.add_listener(lambda event, data: live.append((event, dict(data))) if event != 'turn' else None)
+    with HandHistoryWriter(path) as writer:
+        writer.attach(game)
+        play_hands(game, 30, random.Random(5))
+
+    assert {'showdown', 'award', 'street', 'fold'} <= {event for event, _ in live}
+
+    reader = HandHistoryReader(path)
+    assert len(reader) == 30
+    replayed = [record for hand in range(len(reader)) for record in reader.replay(hand)]
+    assert len(replayed) == len(live)
+    for (event, data), (replayed_event, replayed_data) in zip(live, replayed):
+        assert event == replayed_event
+        for key, value in data.items():
+            assert normalize(value) == normalize(replayed_data[key]), (event, key)
\ No newline at end of file
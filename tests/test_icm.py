@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from game.icm import icm
+
+def malmuth_harville(stacks, payouts):
+    # Walk every finishing order: each place goes to a player in proportion to their stack
+    values = np.zeros(len(stacks))
+
+    def finish(left, prob, place):
+        if place >= len(payouts) or not left:
+            return
+        total = sum(stacks[j] for j in left)
+        for j in left:
+            p = prob * stacks[j] / total
+            values[j] += p * payouts[place]
+            finish([k for k in left if k != j], p, place + 1)
+
+    finish(list(range(len(stacks))), 1.0, 0)
+    return values
+
+@pytest.mark.parametrize('num_players', [2, 3, 5, 7])
+def test_exact_matches_brute_force(num_players):
+    rng = np.random.default_rng(num_players)
+    stacks = rng.integers(1, 5000, num_players).astype(float)
+    payouts = [50, 30, 20, 10, 5][:num_players]
+    assert np.allclose(icm(stacks, payouts), malmuth_harville(stacks, payouts))
+
+def test_batch_matches_single():
+    rng = np.random.default_rng(0)
+    stacks = rng.integers(1, 5000, (20, 6))
+    payouts = [50, 30, 20]
+    batch = icm(stacks, payouts)
+    assert np.allclose(batch, [icm(s, payouts) for s in stacks])
+    assert np.allclose(batch.sum(axis=1), sum(payouts))
+
+def test_monte_carlo_close_to_exact():
+    rng = np.random.default_rng(1)
+    stacks = rng.integers(1, 20000, 9)
+    payouts = [30, 20, 14, 10, 8, 6, 5, 4, 3]
+    exact = icm(stacks, payouts)
+    sampled = icm(stacks, payouts, samples=200000, rng=rng)
+    assert np.abs(sampled - exact).max() < 0.2
+
+def test_busted_players_split_the_bottom_places():
+    values = icm([5000, 0, 3000, 0], [50, 30, 20, 10])
+    assert values[1] == values[3] == pytest.approx(15)
+    assert values.sum() == pytest.approx(110)
\ No newline at end of file
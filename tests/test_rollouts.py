@@ -0,0 +1,31 @@
+import random
+import numpy as np
+from game.equity import exact_equity
+from game.poker_game import PokerGame
+from game.rollouts import RolloutPool
+
+def flop_game():
+    game = PokerGame(6, 10, random.Random(1))
+    game.initialize_game([f'p{i}' for i in range(6)], 1000)
+    game.start_new_hand()
+    game.deal_next_street()
+    game.players[2].is_folded = True
+    return game
+
+def test_pool_matches_exact_equity():
+    game = flop_game()
+    live = [p for p in game.players if not p.is_folded]
+    win, tie = exact_equity([p.cards for p in live], game.community_cards)
+    with RolloutPool(2) as pool:
+        results = pool.equity(game, 40000, seed=1)
+    assert [player for player, _, _ in results] == live
+    assert np.abs(np.array([w for _, w, _ in results]) - win).max() < 0.01
+    assert np.abs(np.array([t for _, _, t in results]) - tie).max() < 0.01
+
+def test_result_does_not_depend_on_worker_count():
+    game = flop_game()
+    with RolloutPool(1) as pool:
+        single = pool.equity(game, 8000, seed=3)
+    with RolloutPool(2) as pool:
+        double = pool.equity(game, 8000, seed=3)
+    assert single == double
\ No newline at end of file
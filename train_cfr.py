@@ -0,0 +1,32 @@
+import argparse
+import time
+from game.cfr import DEFAULT_CONFIG, CFRTrainer, InfosetTable
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPoker-Texas MCCFR 训练")
+    parser.add_argument('path', help="信息集表和检查点所在目录（已存在则继续训练）")
+    parser.add_argument('-n', '--iterations', type=int, default=100000, help="训练迭代次数")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="并行进程数")
+    parser.add_argument('--slots', type=int, default=1 << 22, help="新建表的槽位数")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--checkpoint-every', type=int, default=10000, help="每多少次迭代保存一次")
+    parser.add_argument('--players', type=int, default=DEFAULT_CONFIG['num_players'], help="玩家数量")
+    parser.add_argument('--stack', type=int, default=DEFAULT_CONFIG['stack'], help="初始筹码")
+    parser.add_argument('--small-blind', type=int, default=DEFAULT_CONFIG['small_blind'], help="小盲注")
+    args = parser.parse_args()
+
+    trainer = CFRTrainer(args.path, args.slots, num_players=args.players, stack=args.stack,
+                         small_blind=args.small_blind)
+    table = trainer.table
+    print(f"信息集表: {table.num_slots} 个槽位，{table.nbytes / 2**20:.1f} MiB "
+          f"（每槽位 {InfosetTable.bytes_per_slot()} 字节），已训练 {trainer.iterations} 次")
+
+    start = time.perf_counter()
+    trainer.train(args.iterations, args.seed, args.workers, args.checkpoint_every)
+    elapsed = time.perf_counter() - start
+    print(f"迭代: {trainer.iterations}  用时: {elapsed:.1f}s  "
+          f"速度: {args.iterations / elapsed:.0f} 次/秒  "
+          f"已用槽位: {table.touched()}  冲突: {table.collisions}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file